@@ -4,175 +4,258 @@ Advanced OSINT Features for Cybersecurity Education
 ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
 """
 
-import requests
-import re
-import json
-import time
-from bs4 import BeautifulSoup
+from checkpoint import scan_key
+from http_layer import RESPONSES, fetch, get_session
+from records import EmailCandidate, HeaderAudit, HTTPFinding, Page, RecordEmitter, ScanError, Technology
+from metrics import instrumented
 from urllib.parse import urljoin, urlparse
-import hashlib
 
-class AdvancedOSINT:
+class AdvancedOSINT(RecordEmitter):
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        })
+        self.session = get_session()
     
+    @instrumented('email', label=lambda first_name, last_name, domain: domain)
     def email_intelligence(self, first_name, last_name, domain):
         """Generate possible email formats for security testing"""
         print(f"\n📧 [EMAIL INTELLIGENCE] Generating formats for {first_name} {last_name} @ {domain}")
         
         formats = [
-            f"{first_name}.{last_name}@{domain}",
-            f"{first_name}@{domain}",
-            f"{last_name}@{domain}",
-            f"{first_name[0]}{last_name}@{domain}",
-            f"{first_name}{last_name[0]}@{domain}",
-            f"{first_name}_{last_name}@{domain}",
-            f"{first_name}-{last_name}@{domain}",
-            f"{last_name}.{first_name}@{domain}",
-            f"{first_name[0]}.{last_name}@{domain}",
+            ('first.last', f"{first_name}.{last_name}@{domain}"),
+            ('first', f"{first_name}@{domain}"),
+            ('last', f"{last_name}@{domain}"),
+            ('flast', f"{first_name[0]}{last_name}@{domain}"),
+            ('firstl', f"{first_name}{last_name[0]}@{domain}"),
+            ('first_last', f"{first_name}_{last_name}@{domain}"),
+            ('first-last', f"{first_name}-{last_name}@{domain}"),
+            ('last.first', f"{last_name}.{first_name}@{domain}"),
+            ('f.last', f"{first_name[0]}.{last_name}@{domain}"),
         ]
         
         print("   Generated email formats:")
-        for i, email in enumerate(formats, 1):
+        candidates = []
+        for i, (pattern, email) in enumerate(formats, 1):
             print(f"   {i:2}. {email}")
+            candidates.append(self.emit(EmailCandidate(email, pattern)))
         
-        return formats
+        return candidates
     
-    def metadata_analysis(self, url):
-        """Extract and analyze metadata from web resources"""
+    @instrumented('metadata')
+    def metadata_analysis(self, url, response=None, head_only=False, max_bytes=None):
+        """Extract and analyze metadata from web resources (max_bytes defaults to html_metadata.DEFAULT_MAX_BYTES)"""
+        # lxml is only loaded when metadata is actually extracted
+        from html_metadata import CHUNK_SIZE, DEFAULT_MAX_BYTES, extract_metadata, iter_chunks
+        max_bytes = max_bytes or DEFAULT_MAX_BYTES
         print(f"\n📄 [METADATA ANALYSIS] Extracting from: {url}")
         
         try:
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            scope = scan_key('metadata', url, head_only)
+            if self.snapshots is not None:
+                response, previous = self.snapshots.revalidate(scope, url, response, timeout=10)
+                if previous is not None:
+                    print("   ♻️ Page unchanged since the last snapshot, reusing its findings")
+                    return self.track(scope, [self.emit(record) for record in previous], response)
+            elif response is None:
+                response = RESPONSES.get(url)
             
-            meta_data = {}
+            # Reuse a body another analyzer already downloaded, otherwise stream it
+            if response is not None:
+                extracted = extract_metadata(iter_chunks(response.content), head_only, max_bytes)
+            else:
+                with self.session.get(url, timeout=10, stream=True) as streamed:
+                    extracted = extract_metadata(streamed.iter_content(CHUNK_SIZE), head_only, max_bytes)
+            
+            meta_data = extracted['meta']
+            findings = []
             
             # Meta tags
             print("\n   🔍 Meta Tags:")
-            for meta in soup.find_all('meta'):
-                name = meta.get('name') or meta.get('property') or meta.get('http-equiv')
-                content = meta.get('content')
-                if name and content:
-                    meta_data[name] = content
-                    print(f"     {name}: {content[:100]}{'...' if len(content) > 100 else ''}")
+            for name, content in meta_data.items():
+                print(f"     {name}: {content[:100]}{'...' if len(content) > 100 else ''}")
+                findings.append(self.emit(HTTPFinding(url, 'meta', name, content)))
             
             # Links and scripts
             print(f"\n   🔗 External Resources:")
             resources = {
-                'Stylesheets': soup.find_all('link', rel='stylesheet'),
-                'Scripts': soup.find_all('script', src=True),
-                'Images': soup.find_all('img', src=True)
+                'Stylesheets': extracted['stylesheets'],
+                'Scripts': extracted['scripts'],
+                'Images': extracted['images']
             }
             
             for resource_type, items in resources.items():
                 print(f"     {resource_type}: {len(items)}")
-                for item in items[:3]:  # Show first 3
-                    src = item.get('src') or item.get('href')
-                    if src:
-                        full_url = urljoin(url, src)
+                for i, src in enumerate(items):
+                    full_url = urljoin(url, src)
+                    if i < 3:  # Show first 3
                         print(f"       → {full_url[:80]}{'...' if len(full_url) > 80 else ''}")
+                    findings.append(self.emit(HTTPFinding(url, 'resource', resource_type.lower(), full_url)))
+            
+            if extracted['truncated']:
+                print(f"\n   ⚠️ Stopped after {extracted['bytes_read']} bytes (size cap)")
             
-            return meta_data
+            return self.track(scope, findings, response)
             
         except Exception as e:
             print(f"❌ Error in metadata analysis: {e}")
-            return {}
+            return []
     
-    def website_technology(self, url):
+    @instrumented('technology')
+    def website_technology(self, url, response=None):
         """Identify technologies used by website"""
         print(f"\n🛠️ [TECHNOLOGY DETECTION] Analyzing: {url}")
         
-        technologies = {
-            'CMS': ['wordpress', 'joomla', 'drupal', 'wix', 'squarespace'],
-            'Frameworks': ['react', 'angular', 'vue', 'django', 'flask', 'laravel'],
-            'Web Servers': ['apache', 'nginx', 'iis', 'cloudflare'],
-            'Programming': ['php', 'python', 'ruby', 'node.js', 'java'],
-            'E-commerce': ['shopify', 'magento', 'woocommerce', 'prestashop']
-        }
-        
         try:
-            response = self.session.get(url, timeout=10)
-            headers = response.headers
-            content = response.text.lower()
+            # Body detections are revalidated with the page; header and cookie
+            # detections are snapshotted on their own and matched on every run
+            scope = scan_key('technology', url)
+            header_scope = scan_key('technology', url, 'headers')
+            previous = None
+            if self.snapshots is not None:
+                response, previous = self.snapshots.revalidate(scope, url, response, timeout=10)
+            elif response is None:
+                response = fetch(url, timeout=10)
             
-            detected = []
+            from fingerprint import default_engine
+            engine = default_engine()
+            if previous is not None:
+                print("   ♻️ Page unchanged since the last snapshot, reusing its body detections")
+                from_body = [(record.name, record.category) for record in previous]
+            else:
+                # Body literal, regex and script-src signatures are matched in one pass
+                from_body = engine.match(response.text)
+            from_headers = engine.describe(engine.scan_headers(response.headers))
             
-            # Check headers
-            server = headers.get('server', '').lower()
-            powered_by = headers.get('x-powered-by', '').lower()
+            detected = []
             
             print("   🔍 Detected Technologies:")
             
-            # Check for technologies in content
-            for category, tech_list in technologies.items():
-                for tech in tech_list:
-                    if tech in content or tech in server or tech in powered_by:
-                        detected.append(tech)
-                        print(f"     ✅ {category}: {tech.title()}")
-            
-            # Check for common patterns
-            patterns = {
-                'Google Analytics': r'ga\(\'create\'|\'UA-\d',
-                'Google Tag Manager': r'googletagmanager',
-                'Facebook Pixel': r'facebook\.com\/tr\/',
-                'jQuery': r'jquery',
-                'Bootstrap': r'bootstrap'
-            }
-            
-            for tech_name, pattern in patterns.items():
-                if re.search(pattern, content, re.IGNORECASE):
-                    detected.append(tech_name)
-                    print(f"     ✅ Analytics/Tools: {tech_name}")
+            for name, category in from_body + [found for found in from_headers if found not in from_body]:
+                detected.append(self.emit(Technology(url, name, category)))
+                print(f"     ✅ {category}: {name}")
             
             if not detected:
                 print("     ⚠️ No common technologies detected")
             
+            self.track(scope, [Technology(url, name, category) for name, category in from_body], response)
+            self.track(header_scope, [Technology(url, name, category) for name, category in from_headers])
             return detected
             
         except Exception as e:
             print(f"❌ Error in technology detection: {e}")
             return []
     
-    def security_headers_audit(self, url):
+    @instrumented('headers')
+    def security_headers_audit(self, url, response=None):
         """Comprehensive security headers audit"""
+        from async_http import SECURITY_HEADERS, fetch_headers, score_headers
         print(f"\n🛡️ [SECURITY HEADERS AUDIT] Testing: {url}")
         
-        security_headers = {
-            'Content-Security-Policy': 'Prevents XSS attacks',
-            'Strict-Transport-Security': 'Enforces HTTPS',
-            'X-Frame-Options': 'Prevents clickjacking',
-            'X-Content-Type-Options': 'Prevents MIME sniffing',
-            'X-XSS-Protection': 'XSS protection for older browsers',
-            'Referrer-Policy': 'Controls referrer information',
-            'Permissions-Policy': 'Controls browser features',
-            'Feature-Policy': 'Controls browser features (older)'
-        }
-        
         try:
-            response = self.session.get(url, timeout=10)
+            # Headers are always re-read: a 304 revalidates the body, not the headers sent with it
+            if response is None:
+                # Reuse a page another analyzer already downloaded; otherwise only the headers are needed
+                response = RESPONSES.get(url) or fetch_headers(url, timeout=10)
             
+            findings = []
             print("   Security Headers Status:")
-            for header, description in security_headers.items():
+            for header, (_, description) in SECURITY_HEADERS.items():
                 value = response.headers.get(header, 'MISSING')
                 status = "✅" if value != 'MISSING' else "❌"
                 print(f"     {status} {header}:")
                 print(f"        Value: {value}")
                 print(f"        Purpose: {description}")
                 print()
+                findings.append(self.emit(HTTPFinding(url, 'security-header', header.lower(), response.headers.get(header))))
             
-            # Calculate security score
-            total_headers = len(security_headers)
-            present_headers = sum(1 for h in security_headers if h in response.headers)
-            security_score = (present_headers / total_headers) * 100
-            
+            security_score, _ = score_headers(response.headers)
             print(f"   📊 Security Headers Score: {security_score:.1f}%")
+            findings.append(self.emit(HTTPFinding(url, 'security-score', 'security_headers', security_score)))
+            return self.track(scan_key('headers', url), findings)
             
         except Exception as e:
             print(f"❌ Error in security headers audit: {e}")
+            return []
+    
+    def bulk_security_audit(self, urls, concurrency=100, timeout=10, per_host=8, adaptive=False):
+        """Score security headers of many URLs, yielding a HeaderAudit per URL as it completes
+
+        urls can be any iterable (a file object streams lazily). Requests are
+        HEADs on pooled keep-alive connections, so no response body is read.
+        With adaptive set, concurrency is a ceiling for an AIMD window.
+        """
+        from async_http import iter_audit
+        controller = None
+        if adaptive:
+            from congestion import AIMDController
+            controller = AIMDController(concurrency, max_timeout=timeout, min_timeout=1.0)
+        print(f"\n🛡️ [BULK SECURITY HEADERS AUDIT] {'up to ' if adaptive else ''}{concurrency} concurrent requests")
+        
+        targets = (line.strip() for line in urls)
+        targets = (url if url.startswith(('http://', 'https://')) else 'https://' + url
+                   for url in targets if url and not url.startswith('#'))
+        audited = failed = 0
+        for url, response, score, missing, error in iter_audit(targets, concurrency, timeout, per_host,
+                                                               controller=controller):
+            if error is not None:
+                failed += 1
+                print(f"   ❌ {url}: {error}")
+                yield self.emit(ScanError(url, 'headers', error))
+                continue
+            audited += 1
+            print(f"   {score:5.1f}%  {response.status_code}  {url}")
+            record = self.emit(HeaderAudit(url, response.url, response.status_code, score, missing))
+            yield from self.track(scan_key('audit', url), [record])
+        print(f"   📊 Audited {audited} URLs ({failed} failed)")
+        if controller is not None:
+            print(f"   📶 Adaptive: {controller.summary()}")
+    
+    @instrumented('crawl', label=lambda seeds, *args, **kwargs: seeds[0] if len(seeds) == 1 else f"{len(seeds)} seeds")
+    def crawl_inventory(self, seeds, allowed_hosts=None, max_depth=2, max_pages=100, workers=8, delay=0.25,
+                        processes=None):
+        """Crawl from seed URLs and yield Page, metadata and Technology records for every page
+
+        Only hosts in allowed_hosts are followed; by default that is the seeds' own hosts.
+        """
+        from crawler import Crawler
+        seeds = [url if url.startswith(('http://', 'https://')) else 'https://' + url for url in seeds]
+        if allowed_hosts is None:
+            allowed_hosts = {urlparse(url).hostname for url in seeds}
+        print(f"\n🕸️ [CRAWL] {', '.join(seeds)} (hosts: {', '.join(sorted(allowed_hosts))}; "
+              f"depth {max_depth}, up to {max_pages} pages)")
+        
+        crawler = Crawler(allowed_hosts, max_depth, max_pages, workers, delay, processes)
+        pages = duplicates = failed = 0
+        technologies = set()
+        for page in crawler.crawl(seeds):
+            if page.error is not None:
+                failed += 1
+                print(f"   ❌ {page.url}: {page.error}")
+                yield self.emit(ScanError(page.url, 'crawl', page.error))
+                continue
+            pages += 1
+            yield self.emit(Page(page.url, page.final_url, page.depth, page.status_code, page.content_type,
+                                 page.size, page.content_hash, page.duplicate_of))
+            if page.duplicate_of is not None:
+                duplicates += 1
+                print(f"   ♊ [{page.depth}] {page.final_url} (same content as {page.duplicate_of})")
+                continue
+            if page.parsed is None:
+                print(f"   ⏭️ [{page.depth}] {page.final_url} ({page.status_code} {page.content_type or 'no content'})")
+                continue
+            
+            extracted, detected = page.parsed
+            print(f"   ✅ [{page.depth}] {page.final_url} ({page.status_code}, {page.size} bytes, "
+                  f"{len(extracted['links'])} links, {len(detected)} technologies)")
+            for name, content in extracted['meta'].items():
+                yield self.emit(HTTPFinding(page.final_url, 'meta', name, content))
+            for resource_type in ('stylesheets', 'scripts', 'images'):
+                for src in extracted[resource_type]:
+                    yield self.emit(HTTPFinding(page.final_url, 'resource', resource_type, urljoin(page.final_url, src)))
+            for name, category in detected:
+                technologies.add(name)
+                yield self.emit(Technology(page.final_url, name, category))
+        
+        print(f"   📊 Crawled {pages} pages ({duplicates} duplicates, {failed} failed); "
+              f"technologies: {', '.join(sorted(technologies)) or 'none'}")
 
 def main():
     advanced = AdvancedOSINT()
@@ -190,7 +273,7 @@ def main():
     # Email intelligence example
     advanced.email_intelligence("john", "doe", "company.com")
     
-    # Technology detection example
+    # Technology detection example (the page is downloaded once and shared)
     advanced.website_technology("https://httpbin.org")
     
     # Security headers audit example
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Header-only asyncio HTTP/1.1 client for bulk security-header audits
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import http.client
+import io
+import ssl
+import time
+from collections import defaultdict
+from urllib.parse import urljoin, urlsplit
+from async_utils import adaptive_map, bounded_map, iterate_async
+from metrics import METRICS
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Header -> (short label, purpose); the security score is the share of these a response sets
+SECURITY_HEADERS = {
+    'Content-Security-Policy': ('Content Security Policy', 'Prevents XSS attacks'),
+    'Strict-Transport-Security': ('HSTS Policy', 'Enforces HTTPS'),
+    'X-Frame-Options': ('Clickjacking Protection', 'Prevents clickjacking'),
+    'X-Content-Type-Options': ('MIME Sniffing Prevention', 'Prevents MIME sniffing'),
+    'X-XSS-Protection': ('XSS Protection', 'XSS protection for older browsers'),
+    'Referrer-Policy': ('Referrer Policy', 'Controls referrer information'),
+    'Permissions-Policy': ('Permissions Policy', 'Controls browser features'),
+    'Feature-Policy': ('Feature Policy', 'Controls browser features (older)'),
+}
+
+# Servers that reject HEAD answer with one of these; the request is retried as a GET.
+# A 403 or 404 is a real answer for the URL, and a GET would only ask the same refusing host twice
+HEAD_UNSUPPORTED = {400, 405, 501}
+
+# The server asking us to slow down
+PUSHBACK_STATUSES = {429, 503}
+
+MAX_HEADER_BYTES = 256 * 1024
+
+def score_headers(headers):
+    """Return (score percent, missing header names) for any case-insensitive header mapping"""
+    missing = [name for name in SECURITY_HEADERS if headers.get(name) is None]
+    score = (len(SECURITY_HEADERS) - len(missing)) / len(SECURITY_HEADERS) * 100
+    return round(score, 1), missing
+
+class HeaderResponse:
+    """Status line and headers of a response whose body was never read"""
+    __slots__ = ('url', 'status_code', 'headers', 'method')
+    
+    def __init__(self, url, status_code, headers, method):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.method = method
+
+class AsyncHTTPClient:
+    """Keep-alive connection pool that fetches only response headers
+
+    HEAD responses leave the connection reusable; a GET fallback is abandoned
+    as soon as its headers arrive, so that connection is closed instead of
+    draining a body nobody reads.
+    """
+    def __init__(self, timeout=10.0, per_host=8, verify=True, max_redirects=5):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl.create_default_context()
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.idle = defaultdict(list)
+        self.host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+    
+    async def _connect(self, key):
+        idle = self.idle[key]
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self.ssl_context if scheme == 'https' else None,
+            server_hostname=host if scheme == 'https' else None, limit=MAX_HEADER_BYTES)
+        return reader, writer, False
+    
+    async def _exchange(self, method, url):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"unsupported URL scheme: {url}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        host_header = parts.hostname if parts.port is None else f'{parts.hostname}:{parts.port}'
+        request = (f'{method} {target} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n'
+                   f'Accept: */*\r\nConnection: keep-alive\r\n\r\n').encode('latin-1')
+        
+        async with self.host_limits[key]:
+            for attempt in range(2):
+                reader, writer, reused = await self._connect(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # The server may have dropped an idle keep-alive connection; retry once on a fresh one
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                break
+            
+            status_line, _, header_block = head.partition(b'\r\n')
+            version, status = status_line.decode('latin-1').split(' ', 2)[:2]
+            headers = http.client.parse_headers(io.BytesIO(header_block))
+            reusable = (method == 'HEAD' and version == 'HTTP/1.1'
+                        and (headers.get('Connection') or '').lower() != 'close')
+            if reusable and len(self.idle[key]) < self.per_host:
+                self.idle[key].append((reader, writer))
+            else:
+                writer.close()
+            return int(status), headers
+    
+    async def head(self, url, timeout=None):
+        """Return a HeaderResponse for url, following redirects and falling back to GET"""
+        token = METRICS.start('http')
+        outcome = 'cancelled'
+        try:
+            response = await asyncio.wait_for(self._follow(url), timeout or self.timeout)
+            outcome = 'ok'
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            raise
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            METRICS.stop(token, outcome)
+        return response
+    
+    async def _follow(self, url):
+        method = 'HEAD'
+        for _ in range(self.max_redirects + 1):
+            try:
+                status, headers = await self._exchange(method, url)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Some servers hang up on HEAD instead of answering it
+                if method != 'HEAD':
+                    raise
+                method = 'GET'
+                status, headers = await self._exchange(method, url)
+            if method == 'HEAD' and status in HEAD_UNSUPPORTED:
+                method = 'GET'
+                status, headers = await self._exchange(method, url)
+            location = headers.get('Location')
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return HeaderResponse(url, status, headers, method)
+        raise ConnectionError(f"too many redirects for {url}")
+    
+    async def close(self):
+        for connections in self.idle.values():
+            for reader, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+async def audit_urls(urls, concurrency=100, timeout=10.0, per_host=8, verify=True, controller=None):
+    """Yield (url, response, score, missing, error) for each URL as its headers arrive
+
+    urls may be any iterable, including a lazily read file; at most
+    concurrency requests are in flight at once. With a controller, the number
+    in flight and the timeout adapt instead, and timeouts, 429s and 503s are
+    retried once.
+    """
+    client = AsyncHTTPClient(timeout=timeout, per_host=per_host, verify=verify)
+    
+    async def audit(url):
+        start = time.perf_counter()
+        try:
+            response = await client.head(url, controller.timeout() if controller else None)
+        except asyncio.TimeoutError:
+            if controller is not None:
+                controller.congestion()
+            return url, None, None, None, 'TIMEOUT'
+        except Exception as e:
+            return url, None, None, None, str(e) or type(e).__name__
+        if controller is not None:
+            if response.status_code in PUSHBACK_STATUSES:
+                controller.congestion()
+            else:
+                controller.observe(time.perf_counter() - start)
+        score, missing = score_headers(response.headers)
+        return url, response, score, missing, None
+    
+    def dropped(result):
+        return result[4] == 'TIMEOUT' or (result[1] is not None and result[1].status_code in PUSHBACK_STATUSES)
+    
+    if controller is None:
+        results = bounded_map(audit, urls, concurrency)
+    else:
+        results = adaptive_map(audit, urls, controller, dropped)
+    try:
+        async for result in results:
+            yield result
+    finally:
+        await client.close()
+
+def iter_audit(urls, concurrency=100, timeout=10.0, per_host=8, verify=True, controller=None):
+    """Blocking generator around audit_urls"""
+    return iterate_async(audit_urls(urls, concurrency, timeout, per_host, verify, controller))
+
+def fetch_headers(url, timeout=10.0, verify=True):
+    """Blocking single-URL header fetch"""
+    async def run():
+        client = AsyncHTTPClient(timeout=timeout, verify=verify)
+        try:
+            return await client.head(url)
+        finally:
+            await client.close()
+    return asyncio.run(run())
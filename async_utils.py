@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Asyncio helpers shared by the OSINT engines
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+from collections import deque
+
+async def bounded_map(func, items, concurrency):
+    """Apply an async function to items with a fixed number in flight, yielding results as they complete"""
+    items = iter(items)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    finished = object()
+    
+    async def worker():
+        # Workers share one iterator, so items are pulled lazily
+        for item in items:
+            await queue.put(await func(item))
+    
+    async def run():
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        except asyncio.CancelledError:
+            # The consumer went away; nobody is left to read the sentinel
+            raise
+        except BaseException:
+            await queue.put(finished)
+            raise
+        await queue.put(finished)
+    
+    runner = asyncio.ensure_future(run())
+    try:
+        while True:
+            result = await queue.get()
+            if result is finished:
+                break
+            yield result
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+
+async def adaptive_map(func, items, controller, dropped, retries=1):
+    """Like bounded_map, but the number in flight follows controller.window()
+
+    Results for which dropped(result) is true (a timeout, SERVFAIL, 429...)
+    go to a retry queue and are tried again, up to retries times, before the
+    next fresh item; only the final attempt's result is yielded.
+    """
+    items = iter(items)
+    retry = deque()
+    running = {}
+    done = asyncio.Queue()
+    exhausted = False
+    try:
+        while True:
+            while len(running) < controller.window() and (retry or not exhausted):
+                if retry:
+                    item, attempt = retry.popleft()
+                else:
+                    try:
+                        item, attempt = next(items), 0
+                    except StopIteration:
+                        exhausted = True
+                        break
+                task = asyncio.ensure_future(func(item))
+                task.add_done_callback(done.put_nowait)
+                running[task] = (item, attempt)
+            if not running:
+                break
+            
+            task = await done.get()
+            item, attempt = running.pop(task)
+            result = task.result()
+            if attempt < retries and dropped(result):
+                controller.retried += 1
+                retry.append((item, attempt + 1))
+                continue
+            yield result
+    finally:
+        for task in running:
+            task.cancel()
+
+def iterate_async(agen):
+    """Drive an async generator from synchronous code one item at a time"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        try:
+            loop.run_until_complete(agen.aclose())
+        except Exception:
+            pass
+        # Stopping early (an interrupt or a consumer break) can leave queries running; cancel them
+        # like asyncio.run does, so the loop closes cleanly and a later resume starts quiet.
+        # asyncio.wait_for can swallow a cancel that races its own result (fixed in Python 3.12),
+        # leaving a worker blocked on a queue nobody reads, so cancel again until every task is done
+        pending = asyncio.all_tasks(loop)
+        while pending:
+            for task in pending:
+                task.cancel()
+            done, pending = loop.run_until_complete(asyncio.wait(pending, timeout=0.1))
+            for task in done:
+                # Retrieved like gather(return_exceptions=True) would, so nothing is logged as unhandled
+                if not task.cancelled():
+                    task.exception()
+        loop.close()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Fingerprint engine benchmark: cost per MB as the signature count grows
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+
+Usage: python benchmarks/bench_fingerprint.py [--size-mb 4] [--counts 10,100,1000,5000]
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fingerprint import FingerprintEngine
+
+def synthetic_signatures(count, seed=1):
+    """Random literal and script-src signatures, like a large third-party signature set"""
+    rng = random.Random(seed)
+    signatures = []
+    for i in range(count):
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+        signature = {'name': f'tech-{i}', 'category': 'Synthetic', 'body': [word, f'{word}-{i}.js']}
+        if i % 10 == 0:
+            signature['script_src'] = [re.escape(word) + r'(?:\.min)?\.js']
+        signatures.append(signature)
+    return signatures
+
+def synthetic_page(size, signatures, seed=2):
+    """HTML-ish text of roughly size bytes with a sprinkling of real signature hits"""
+    rng = random.Random(seed)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(5000)]
+    parts, total = ['<html><head>'], 0
+    while total < size:
+        if rng.random() < 0.002:
+            part = f'<script src="/static/{rng.choice(signatures)["body"][0]}.min.js"></script>'
+        else:
+            part = ' '.join(rng.choices(words, k=20)) + '\n'
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)
+
+def naive_scan(signatures, text):
+    """The per-keyword approach website_technology used before the engine"""
+    content = text.lower()
+    return {i for i, signature in enumerate(signatures) for literal in signature['body'] if literal in content}
+
+def time_call(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Fingerprint engine cost per MB')
+    parser.add_argument('--size-mb', type=float, default=4)
+    parser.add_argument('--counts', default='10,100,1000,5000')
+    parser.add_argument('--chunk-kb', type=int, default=64, help='Chunk size for the streaming scanner')
+    args = parser.parse_args()
+    
+    size = int(args.size_mb * 1024 * 1024)
+    print(f"{'signatures':>10} {'compile ms':>10} {'engine ms/MB':>13} {'stream ms/MB':>13} {'naive ms/MB':>12} {'hits':>6}")
+    for count in (int(c) for c in args.counts.split(',')):
+        signatures = synthetic_signatures(count)
+        page = synthetic_page(size, signatures)
+        mb = len(page.encode()) / (1024 * 1024)
+        
+        start = time.perf_counter()
+        engine = FingerprintEngine(signatures)
+        compile_ms = (time.perf_counter() - start) * 1000
+        
+        hits = engine.scan_body(page)
+        engine_time = time_call(lambda: engine.scan_body(page))
+        
+        data = page.encode()
+        chunk = args.chunk_kb * 1024
+        
+        def streamed():
+            stream = engine.stream()
+            for offset in range(0, len(data), chunk):
+                stream.feed(data[offset:offset + chunk])
+            return stream.close()
+        
+        stream_time = time_call(streamed)
+        naive_time = time_call(lambda: naive_scan(signatures, page), repeat=1)
+        
+        print(f"{count:>10} {compile_ms:>10.1f} {engine_time * 1000 / mb:>13.1f} "
+              f"{stream_time * 1000 / mb:>13.1f} {naive_time * 1000 / mb:>12.1f} {len(hits):>6}")
+
+if __name__ == '__main__':
+    main()
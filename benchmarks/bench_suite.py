@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite against local DNS, HTTP and TCP stand-ins
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+
+Usage: python benchmarks/bench_suite.py [--scenarios subdomains,ports] [--update-baseline]
+
+Each scenario drives the real OSINTTool/AdvancedOSINT methods against stand-ins
+on 127.0.0.1 and reports throughput and latency. Results are compared with
+benchmarks/baseline.json; the exit status is 1 if any metric regressed by more
+than the tolerance, so the suite can gate changes. The committed baseline holds
+each metric's slowest value over ten separate runs with default settings, so
+an ordinary slow run on a noisy machine does not read as a regression.
+"""
+
+import argparse
+import contextlib
+import ipaddress
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# Keep the persistent DNS cache and checkpoints of real runs out of the measurements
+os.environ['XDG_CACHE_HOME'] = tempfile.mkdtemp(prefix='osint-bench-')
+
+import dns.reversename
+from standins import DNSStandIn, HTTPStandIn, RemoteStandIn, TCPFarm, synthetic_page
+from advance_osint import AdvancedOSINT
+from dns_engine import AsyncDNSEngine
+from http_layer import fetch
+from metrics import METRICS
+from osint import OSINTTool
+from ptr_sweep import count_addresses
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Metrics where bigger is better; latencies and durations are better smaller,
+# and anything counted (found, open...) is a correctness check that must match exactly
+HIGHER_IS_BETTER = ('_per_sec', 'mb_per_sec')
+LOWER_IS_BETTER = ('_ms', '_s')
+
+def quiet():
+    """Silence the tools' progress output while timing"""
+    return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+def make_tool(dns_server):
+    tool = OSINTTool()
+    tool.dns = AsyncDNSEngine(timeout=2.0, nameservers=[dns_server.address[0]], port=dns_server.port)
+    return tool
+
+def stage_latency(stage, prefix):
+    stat = METRICS.stat(stage)
+    return {f'{prefix}_p50_ms': round(stat.quantile(0.50) * 1000, 2),
+            f'{prefix}_p95_ms': round(stat.quantile(0.95) * 1000, 2)}
+
+def bench_subdomains(args, dns_server):
+    tool = make_tool(dns_server)
+    hits = [f'h{i}' for i in range(0, args.words, 100)]
+    words = [f'w{i}' for i in range(args.words - len(hits))] + hits
+    start = time.perf_counter()
+    with quiet():
+        found = tool.subdomain_discovery('bench.test', words, args.concurrency)
+    elapsed = time.perf_counter() - start
+    return dict(names_per_sec=round(len(words) / elapsed, 1), found=len(found), **stage_latency('dns', 'dns'))
+
+def bench_subdomains_wildcard(args, dns_server):
+    tool = make_tool(dns_server)
+    words = [f'w{i}' for i in range(args.words)]
+    start = time.perf_counter()
+    with quiet():
+        found = tool.subdomain_discovery('wild.test', words, args.concurrency)
+    elapsed = time.perf_counter() - start
+    return dict(names_per_sec=round(len(words) / elapsed, 1), found=len(found), **stage_latency('dns', 'dns'))
+
+def bench_ptr(args, dns_server):
+    tool = make_tool(dns_server)
+    start = time.perf_counter()
+    with quiet():
+        found = list(tool.ptr_sweep([args.ptr_cidr], args.concurrency, rate=0))
+    elapsed = time.perf_counter() - start
+    return dict(addresses_per_sec=round(count_addresses([args.ptr_cidr]) / elapsed, 1), found=len(found),
+                **stage_latency('dns', 'dns'))
+
+def bench_recon(args, dns_server):
+    tool = make_tool(dns_server)
+    domains = [f'site{i}.test' for i in range(args.domains)]
+    with quiet():
+        for domain in domains[:20]:
+            tool.domain_reconnaissance(domain)
+        single = stage_latency('recon', 'recon')
+        start = time.perf_counter()
+        records = tool.domain_reconnaissance_bulk(domains)
+        elapsed = time.perf_counter() - start
+    return dict(domains_per_sec=round(len(domains) / elapsed, 1), records=len(records), **single)
+
+def bench_ports(args, farm):
+    tool = OSINTTool()
+    start = time.perf_counter()
+    with quiet():
+        open_ports = tool.network_port_scan('127.0.0.1', farm.ports, max_inflight=1000, timeout=args.port_timeout)
+    elapsed = time.perf_counter() - start
+    stat = METRICS.stat('tcp')
+    return dict(ports_per_sec=round(len(farm.ports) / elapsed, 1), scan_s=round(elapsed, 3),
+                open=len(open_ports), filtered=stat.timeouts, **stage_latency('tcp', 'connect'))
+
+def bench_technology(args, http_server):
+    advanced = AdvancedOSINT()
+    url = http_server.url('/technology')
+    response = fetch(url)
+    with quiet():
+        detected = advanced.website_technology(url, response)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            advanced.website_technology(url, response)
+        elapsed = time.perf_counter() - start
+    mb = len(response.content) * args.repeat / (1024 * 1024)
+    return dict(mb_per_sec=round(mb / elapsed, 2), call_ms=round(elapsed * 1000 / args.repeat, 2),
+                technologies=len(detected))
+
+def bench_metadata(args, http_server):
+    advanced = AdvancedOSINT()
+    start = time.perf_counter()
+    with quiet():
+        # Fresh URLs miss the shared response cache, so every call streams the page over HTTP
+        for i in range(args.repeat):
+            findings = advanced.metadata_analysis(http_server.url(f'/metadata?{i}'))
+    elapsed = time.perf_counter() - start
+    mb = len(synthetic_page(args.page_kb * 1024)) * args.repeat / (1024 * 1024)
+    return dict(mb_per_sec=round(mb / elapsed, 2), call_ms=round(elapsed * 1000 / args.repeat, 2),
+                findings=len(findings), **stage_latency('parse.metadata', 'parse'))
+
+def bench_headers_audit(args, http_server):
+    advanced = AdvancedOSINT()
+    urls = [http_server.url(f'/audit?{i}') for i in range(args.audit_urls)]
+    start = time.perf_counter()
+    with quiet():
+        audits = list(advanced.bulk_security_audit(urls, args.concurrency))
+    elapsed = time.perf_counter() - start
+    return dict(urls_per_sec=round(len(urls) / elapsed, 1), audited=sum(r.kind == 'header-audit' for r in audits),
+                **stage_latency('http', 'http'))
+
+SCENARIOS = {
+    'subdomains': ('dns', bench_subdomains),
+    'subdomains_wildcard': ('dns', bench_subdomains_wildcard),
+    'recon': ('dns', bench_recon),
+    'ptr': ('dns', bench_ptr),
+    'ports': ('tcp', bench_ports),
+    'technology': ('http', bench_technology),
+    'metadata': ('http', bench_metadata),
+    'headers_audit': ('http', bench_headers_audit),
+}
+
+def bench_zone(args):
+    records = {f'h{i}.bench.test': {'A': [f'10.0.{i // 256 % 256}.{i % 256}']} for i in range(0, args.words, 100)}
+    network = ipaddress.ip_network(args.ptr_cidr)
+    for i in range(0, network.num_addresses, 50):
+        records[dns.reversename.from_address(str(network[i])).to_text().rstrip('.')] = {'PTR': [f'host{i}.bench.test.']}
+    for i in range(args.domains):
+        records[f'site{i}.test'] = {
+            'A': [f'10.1.{i // 256 % 256}.{i % 256}'],
+            'MX': [f'10 mail.site{i}.test.'],
+            'NS': [f'ns1.site{i}.test.', f'ns2.site{i}.test.'],
+            'TXT': ['"v=spf1 -all"'],
+        }
+    return records
+
+def compare(results, baseline, tolerance, latency_floor_ms=10.0):
+    """Yield (scenario, metric, old, new, verdict) for every metric present in both
+
+    Latencies and durations also have to grow by more than latency_floor_ms
+    before they count as regressed: 25% of a 15 ms p95 is scheduler noise.
+    """
+    for scenario, metrics in results.items():
+        for metric, new in metrics.items():
+            old = baseline.get(scenario, {}).get(metric)
+            if old is None:
+                continue
+            if metric.endswith(HIGHER_IS_BETTER):
+                verdict = 'REGRESSED' if new < old * (1 - tolerance) else 'ok'
+            elif metric.endswith(LOWER_IS_BETTER):
+                floor = latency_floor_ms if metric.endswith('_ms') else latency_floor_ms / 1000
+                verdict = 'REGRESSED' if new > old * (1 + tolerance) and new - old > floor else 'ok'
+            else:
+                verdict = 'MISMATCH' if new != old else 'ok'
+            yield scenario, metric, old, new, verdict
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline OSINT benchmark suite')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"Comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument('--words', type=int, default=5000, help='Wordlist size for subdomain scenarios')
+    parser.add_argument('--domains', type=int, default=200, help='Domains for the recon scenario')
+    parser.add_argument('--ptr-cidr', default='10.30.0.0/20', help='Range swept by the PTR scenario')
+    parser.add_argument('--concurrency', type=int, default=100, help='DNS queries in flight')
+    parser.add_argument('--dns-latency', type=float, default=0.005, help='Seconds the DNS stand-in waits before answering')
+    parser.add_argument('--page-kb', type=int, default=512, help='Size of the HTTP stand-in page')
+    parser.add_argument('--closed-ports', type=int, default=2000, help='Closed ports in the TCP farm')
+    parser.add_argument('--port-timeout', type=float, default=0.5, help='Connect timeout cap for the port scan')
+    parser.add_argument('--repeat', type=int, default=20, help='Calls per HTTP scenario')
+    parser.add_argument('--audit-urls', type=int, default=2000, help='URLs for the bulk header audit scenario')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown before failing')
+    parser.add_argument('--latency-floor-ms', type=float, default=10.0,
+                        help='Smallest absolute latency increase that can count as a regression')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('-o', '--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+    
+    selected = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    
+    needed = {SCENARIOS[name][0] for name in selected}
+    standins = {}
+    if 'dns' in needed:
+        standins['dns'] = RemoteStandIn(DNSStandIn, bench_zone(args), {'wild.test': '10.9.9.9'},
+                                        latency=args.dns_latency).start()
+    if 'http' in needed:
+        headers = {'Server': 'nginx/1.25.3', 'X-Powered-By': 'PHP/8.2', 'Set-Cookie': 'wordpress_test_cookie=1',
+                   'X-Frame-Options': 'DENY', 'Strict-Transport-Security': 'max-age=31536000'}
+        standins['http'] = RemoteStandIn(HTTPStandIn, args.page_kb * 1024, headers).start()
+    if 'tcp' in needed:
+        standins['tcp'] = TCPFarm(open_ports=20, filtered_ports=5, closed_ports=args.closed_ports).start()
+    
+    METRICS.enable()
+    results = {}
+    try:
+        for name in selected:
+            kind, bench = SCENARIOS[name]
+            METRICS.reset()
+            results[name] = bench(args, standins[kind])
+            print(f"{name:20} " + '  '.join(f"{metric}={value}" for metric, value in results[name].items()))
+    finally:
+        for standin in standins.values():
+            standin.stop()
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    failures = 0
+    print(f"\n{'scenario':20} {'metric':18} {'baseline':>10} {'current':>10}  verdict")
+    for scenario, metric, old, new, verdict in compare(results, baseline, args.tolerance, args.latency_floor_ms):
+        print(f"{scenario:20} {metric:18} {old:>10} {new:>10}  {verdict}")
+        failures += verdict != 'ok'
+    print(f"\n{failures} regressions (tolerance {args.tolerance:.0%})" if failures else "\nNo regressions")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
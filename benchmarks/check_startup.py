@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup budget check: import time and import graph of short CLI runs
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+
+Usage: python benchmarks/check_startup.py [--scale 1.0]
+
+Each case runs osint.py under `python -X importtime` and fails (exit 1) when
+the project's own imports exceed the budget or a module the case must not
+need (the HTTP stack, dnspython, lxml, BeautifulSoup) gets imported. Imports
+already done by a bare interpreter (site, .pth hooks) are not counted.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OSINT = os.path.join(ROOT, 'osint.py')
+
+HTTP_STACK = ('requests', 'urllib3', 'http_layer')
+PARSERS = ('lxml', 'bs4', 'html_metadata', 'fingerprint')
+
+# (name, arguments, budget in ms, top-level modules that must not be imported)
+CASES = [
+    ('help', ['--help'], 60, HTTP_STACK + PARSERS + ('dns', 'asyncio', 'dns_engine', 'port_scanner')),
+    ('port scan', ['-p', '127.0.0.1', '--ports', '{closed_port}'], 120, HTTP_STACK + PARSERS + ('dns', 'dns_engine')),
+    ('ip offline', ['--ip-list', '{ip_list}', '--ip-db', '{ip_db}'], 80,
+     HTTP_STACK + PARSERS + ('dns', 'asyncio', 'dns_engine', 'port_scanner')),
+]
+
+def imported(argv, env):
+    """Return {module: cumulative microseconds} for top-level imports of one run"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, env=env, cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):
+            # Only unindented entries are imported directly; nested ones are already in their cumulative time
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+def free_port():
+    import socket
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+def main():
+    parser = argparse.ArgumentParser(description='Check CLI startup import budgets')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, e.g. 3 for slow ARM devices')
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix='osint-startup-')
+    env = dict(os.environ, XDG_CACHE_HOME=workdir, PYTHONDONTWRITEBYTECODE='')
+    ip_list = os.path.join(workdir, 'ips.txt')
+    ip_db = os.path.join(workdir, 'ranges.csv')
+    with open(ip_list, 'w') as f:
+        f.write('192.0.2.1\n')
+    with open(ip_db, 'w') as f:
+        f.write('192.0.2.0,192.0.2.255,64496,ZZ,Documentation\n')
+    values = {'closed_port': free_port(), 'ip_list': ip_list, 'ip_db': ip_db}
+    
+    interpreter = set(imported(['-c', 'pass'], env))
+    # Warm the bytecode cache so the first case is not charged for compiling
+    imported([OSINT, '--help'], env)
+    
+    failures = 0
+    for name, argv, budget, forbidden in CASES:
+        argv = [OSINT] + [arg.format(**values) for arg in argv]
+        modules = {module: us for module, us in imported(argv, env).items() if module not in interpreter}
+        total_ms = sum(modules.values()) / 1000
+        limit = budget * args.scale
+        leaked = sorted(module for module in modules if module.split('.')[0] in forbidden)
+        ok = total_ms <= limit and not leaked
+        failures += not ok
+        slowest = ', '.join(f'{module} {us / 1000:.1f}ms' for module, us in
+                            sorted(modules.items(), key=lambda item: -item[1])[:3])
+        print(f"{'ok  ' if ok else 'FAIL'} {name:12} {total_ms:7.1f} ms / {limit:.0f} ms budget  (slowest: {slowest})")
+        if leaked:
+            print(f"     imported but not needed: {', '.join(leaked)}")
+    
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Local DNS, HTTP and TCP stand-ins so benchmarks never touch live hosts
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import multiprocessing
+import selectors
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+class DNSStandIn:
+    """Authoritative UDP server answering from an in-memory zone map
+
+    records maps names to {rtype: [values]}; any name under a wildcard zone
+    answers A with that zone's address. Everything else is NXDOMAIN with an
+    SOA, so negative caching behaves as it would against a real server.
+    Replies are delayed by latency seconds without serialising queries.
+    """
+    def __init__(self, records=None, wildcards=None, latency=0.0, host='127.0.0.1', port=0):
+        self.records = {name.lower(): rtypes for name, rtypes in (records or {}).items()}
+        self.wildcards = {zone.lower(): address for zone, address in (wildcards or {}).items()}
+        self.latency = latency
+        self.address = (host, port)
+        self.queries = 0
+        self.loop = None
+        self.thread = None
+    
+    def start(self):
+        ready = threading.Event()
+        
+        def serve():
+            self.loop = asyncio.new_event_loop()
+            server = self
+            
+            class Protocol(asyncio.DatagramProtocol):
+                def connection_made(self, transport):
+                    self.transport = transport
+                
+                def datagram_received(self, data, addr):
+                    server.queries += 1
+                    try:
+                        wire = server.answer(data)
+                    except Exception:
+                        return
+                    if server.latency:
+                        server.loop.call_later(server.latency, self.transport.sendto, wire, addr)
+                    else:
+                        self.transport.sendto(wire, addr)
+            
+            transport, _ = self.loop.run_until_complete(
+                self.loop.create_datagram_endpoint(Protocol, local_addr=self.address))
+            self.address = transport.get_extra_info('sockname')[:2]
+            # Bursts of hundreds of queries overflow the default receive buffer and drop datagrams
+            sock = transport.get_extra_info('socket')
+            for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+                sock.setsockopt(socket.SOL_SOCKET, option, 4 * 1024 * 1024)
+            ready.set()
+            self.loop.run_forever()
+            transport.close()
+            self.loop.close()
+        
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+    
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+    
+    @property
+    def port(self):
+        return self.address[1]
+    
+    def answer(self, data):
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        question = query.question[0]
+        name = question.name.to_text().rstrip('.').lower()
+        rtype = dns.rdatatype.to_text(question.rdtype)
+        
+        rtypes = self.records.get(name)
+        if rtypes is None:
+            zone = next((zone for zone in self.wildcards if name.endswith('.' + zone)), None)
+            if zone is not None:
+                rtypes = {'A': [self.wildcards[zone]]}
+        
+        if rtypes is None:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(self._soa(name))
+        elif rtypes.get(rtype):
+            response.answer.append(dns.rrset.from_text(question.name, 300, 'IN', rtype, *rtypes[rtype]))
+        else:
+            response.authority.append(self._soa(name))
+        return response.to_wire()
+    
+    @staticmethod
+    def _soa(name):
+        zone = '.'.join(name.split('.')[-2:]) + '.'
+        return dns.rrset.from_text(zone, 300, 'IN', 'SOA', f'ns1.{zone} hostmaster.{zone} 1 3600 600 86400 60')
+
+def synthetic_page(size):
+    """HTML of about size bytes with meta tags, resources and a few fingerprintable technologies"""
+    head = ''.join([
+        '<!DOCTYPE html><html><head><title>Benchmark page</title>',
+        '<meta name="description" content="Offline benchmark page">',
+        '<meta name="generator" content="WordPress 6.4">',
+        '<meta property="og:title" content="Benchmark">',
+        '<link rel="stylesheet" href="/wp-content/themes/bench/style.css">',
+        '<link rel="stylesheet" href="/static/site.css">',
+        '<script src="/wp-includes/js/jquery/jquery.min.js"></script>',
+        '<script src="/static/react.production.min.js"></script>',
+        '</head><body>',
+    ])
+    paragraph = '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p>\n'
+    image = '<img src="/static/img/{}.png">\n'
+    parts, total, count = [head], len(head), 0
+    while total < size:
+        part = image.format(count) if count % 20 == 0 else paragraph
+        parts.append(part)
+        total += len(part)
+        count += 1
+    parts.append('</body></html>')
+    return ''.join(parts).encode()
+
+class HTTPStandIn:
+    """Threaded HTTP/1.1 server returning one synthetic page for every path"""
+    def __init__(self, page_size=256 * 1024, headers=None, host='127.0.0.1', port=0):
+        self.body = synthetic_page(page_size)
+        self.headers = dict(headers or {})
+        self.server = None
+        self.address = (host, port)
+    
+    def start(self):
+        standin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def _send_headers(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(standin.body)))
+                for name, value in standin.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+            
+            def do_HEAD(self):
+                self._send_headers()
+            
+            def do_GET(self):
+                self._send_headers()
+                self.wfile.write(standin.body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(self.address, Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address[:2]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+    
+    def url(self, path='/'):
+        return f'http://{self.address[0]}:{self.address[1]}{path}'
+
+class TCPFarm:
+    """Listeners on ephemeral ports: some open, some filtered, plus known closed ports
+
+    A filtered port is a listen(0) socket whose accept queue is already full, so
+    further SYNs are dropped and connects time out exactly like a firewalled port.
+    """
+    def __init__(self, open_ports=20, filtered_ports=5, closed_ports=1000, host='127.0.0.1'):
+        self.host = host
+        self.counts = (open_ports, filtered_ports, closed_ports)
+        self.open, self.filtered, self.closed = [], [], []
+        self.sockets = []
+        self.selector = None
+        self.running = False
+    
+    def _listener(self, backlog):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((self.host, 0))
+        sock.listen(backlog)
+        self.sockets.append(sock)
+        return sock
+    
+    def start(self):
+        open_count, filtered_count, closed_count = self.counts
+        self.selector = selectors.DefaultSelector()
+        for _ in range(open_count):
+            sock = self._listener(1024)
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ)
+            self.open.append(sock.getsockname()[1])
+        
+        for _ in range(filtered_count):
+            sock = self._listener(0)
+            port = sock.getsockname()[1]
+            for _ in range(3):
+                filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                filler.setblocking(False)
+                filler.connect_ex((self.host, port))
+                self.sockets.append(filler)
+            self.filtered.append(port)
+        
+        # Ports that were free a moment ago answer with a reset
+        for _ in range(closed_count):
+            probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            probe.bind((self.host, 0))
+            self.closed.append(probe.getsockname()[1])
+            probe.close()
+        
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+    
+    def _accept_loop(self):
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.2):
+                try:
+                    conn, _ = key.fileobj.accept()
+                    conn.close()
+                except OSError:
+                    pass
+    
+    def stop(self):
+        self.running = False
+        for sock in self.sockets:
+            sock.close()
+    
+    @property
+    def ports(self):
+        return sorted(set(self.open + self.filtered + self.closed))
+
+def _serve_in_child(factory, args, kwargs, conn):
+    standin = factory(*args, **kwargs).start()
+    conn.send(standin.address)
+    conn.recv()
+    standin.stop()
+
+class RemoteStandIn:
+    """Runs a stand-in in a child process, so serving never competes with the measured client for the GIL"""
+    def __init__(self, factory, *args, **kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self.address = None
+        self.process = None
+        self.conn = None
+    
+    def start(self):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve_in_child, daemon=True,
+                                               args=(self.factory, self.args, self.kwargs, child))
+        self.process.start()
+        self.address = tuple(self.conn.recv())
+        return self
+    
+    def stop(self):
+        if self.process is not None:
+            self.conn.send('stop')
+            self.process.join(5)
+    
+    @property
+    def port(self):
+        return self.address[1]
+    
+    def url(self, path='/'):
+        return f'http://{self.address[0]}:{self.address[1]}{path}'
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Periodic scan checkpoints for resuming interrupted runs
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dns_cache import default_cache_dir
+
+def default_checkpoint_path():
+    return os.path.join(default_cache_dir(), 'checkpoint.json')
+
+def scan_key(kind, label, *parts):
+    """Stable section name for a scan: kind, a readable label and a digest of its inputs"""
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    return f"{kind}:{label}:{digest}"
+
+class Progress:
+    """Low watermark over work items that complete out of order
+
+    Everything below offset is done, plus the indexes in done; that is all a
+    resumed scan needs to skip completed work without re-probing any of it.
+    """
+    def __init__(self, offset=0, done=()):
+        self.offset = offset
+        self.done = set(done)
+    
+    def skip(self, index):
+        return index < self.offset or index in self.done
+    
+    def complete(self, index):
+        self.done.add(index)
+        while self.offset in self.done:
+            self.done.remove(self.offset)
+            self.offset += 1
+    
+    @property
+    def count(self):
+        return self.offset + len(self.done)
+    
+    def state(self):
+        return {'offset': self.offset, 'done': sorted(self.done)}
+
+class Checkpoint:
+    """JSON file of per-scan sections, rewritten atomically at most every interval seconds
+
+    Without a path the state only lives in memory, which keeps library use free of disk writes.
+    """
+    def __init__(self, path=None, resume=False, interval=5.0):
+        self.path = path
+        self.resume = resume
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.sections = {}
+        self.last_save = time.monotonic()
+        
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.sections = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable checkpoint {path}: {e}")
+    
+    def load(self, key):
+        """Saved state for a scan when resuming, otherwise an empty dict (and the old state is dropped)"""
+        with self.lock:
+            if self.resume:
+                return dict(self.sections.get(key, {}))
+            if self.sections.pop(key, None) is not None:
+                self._write()
+            return {}
+    
+    def due(self):
+        return time.monotonic() - self.last_save >= self.interval
+    
+    def update(self, key, state, force=False):
+        """Record a scan's state, writing the file if the interval has passed or force is set"""
+        with self.lock:
+            self.sections[key] = state
+            if force or self.due():
+                self._write()
+    
+    def finish(self, key):
+        """Forget a completed scan"""
+        with self.lock:
+            if self.sections.pop(key, None) is not None:
+                self._write()
+    
+    def _write(self):
+        self.last_save = time.monotonic()
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Write then rename, so a crash mid-write never leaves a truncated checkpoint
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.sections, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
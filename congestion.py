@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+AIMD congestion control for DNS, TCP and HTTP probes
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import threading
+import time
+
+class AIMDController:
+    """Concurrency window that finds its own ceiling, the way TCP finds a path's capacity
+
+    The window starts small and doubles every round trip (slow start) until the
+    first congestion signal, then grows by one probe per window of successes
+    while latency stays near the best seen. A timeout, SERVFAIL or 429 halves
+    it, at most once per timeout period so one burst of losses counts as
+    one signal. Probe timeouts follow the measured RTTs (srtt + 4 * rttvar).
+    Engines report what they see through observe() and congestion(); the
+    adaptive_map helpers read window() and retry what was dropped.
+    """
+    def __init__(self, maximum=100, minimum=None, initial=None, decrease=0.5, max_timeout=3.0, min_timeout=0.2,
+                 latency_factor=4.0, latency_slack=0.05):
+        self.maximum = max(1, maximum)
+        # The floor keeps a dead or overloaded peer from stalling a scan to one probe at a time
+        self.minimum = max(1, min(minimum if minimum is not None else self.maximum // 16, self.maximum))
+        self.limit = float(initial if initial is not None else max(self.minimum, min(10, self.maximum)))
+        self.threshold = float(self.maximum)
+        self.decrease = decrease
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self.srtt = None
+        self.rttvar = None
+        self.base_rtt = None
+        self.last_cut = 0.0
+        self.peak = self.limit
+        self.signals = 0
+        self.retried = 0
+        self.lock = threading.Lock()
+    
+    def window(self):
+        """Number of probes allowed in flight right now"""
+        return max(self.minimum, min(self.maximum, int(self.limit)))
+    
+    def timeout(self):
+        """Retransmission-style timeout derived from measured RTTs"""
+        if self.srtt is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+    
+    def healthy(self):
+        """False while smoothed latency sits well above the best RTT seen, i.e. queues are building"""
+        if self.base_rtt is None:
+            return True
+        return self.srtt <= max(self.latency_factor * self.base_rtt, self.base_rtt + self.latency_slack)
+    
+    def observe(self, rtt):
+        """A probe got an answer (any answer) after rtt seconds"""
+        with self.lock:
+            if self.srtt is None:
+                self.srtt, self.rttvar = rtt, rtt / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+                self.srtt = 0.875 * self.srtt + 0.125 * rtt
+            self.base_rtt = rtt if self.base_rtt is None else min(self.base_rtt, rtt)
+            
+            if not self.healthy():
+                return
+            if self.limit < self.threshold:
+                self.limit += 1
+            else:
+                self.limit += 1 / self.limit
+            self.limit = min(self.limit, float(self.maximum))
+            self.peak = max(self.peak, self.limit)
+    
+    def congestion(self):
+        """A probe timed out or the far end pushed back (SERVFAIL, 429, 503)"""
+        with self.lock:
+            self.signals += 1
+            now = time.monotonic()
+            # Probes lost to one burst time out within about one timeout of each other
+            if now - self.last_cut < self.timeout():
+                return
+            self.last_cut = now
+            self.limit = max(float(self.minimum), self.limit * self.decrease)
+            self.threshold = self.limit
+    
+    def summary(self):
+        return (f"window {self.window()} (peak {int(self.peak)}), timeout {self.timeout() * 1000:.0f} ms, "
+                f"{self.signals} congestion signals, {self.retried} retries")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Bounded-depth concurrent crawler for site-wide metadata and technology inventories
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+from metrics import METRICS
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+
+def parse_page(content, headers, max_bytes):
+    """Process-pool worker: metadata, links and technologies of one HTML page
+
+    headers is a plain dict with lowercased names, so it pickles cheaply and
+    the fingerprint engine's header lookups still match.
+    """
+    from fingerprint import default_engine
+    from html_metadata import extract_metadata, iter_chunks
+    extracted = extract_metadata(iter_chunks(content), max_bytes=max_bytes)
+    text = content.decode('utf-8', errors='replace')
+    return extracted, default_engine().match(text, headers)
+
+def normalize_url(url, base=None):
+    """Absolute http(s) URL without fragment and with a lowercase scheme and host, or None"""
+    url = urldefrag(urljoin(base, url) if base else url)[0]
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+        return None
+    netloc = parts.netloc.lower() if '@' not in parts.netloc else parts.netloc
+    return parts._replace(scheme=parts.scheme.lower(), netloc=netloc, path=parts.path or '/').geturl()
+
+class CrawlPage:
+    """Outcome of one crawled URL; parsed is (extracted, technologies) for new HTML pages"""
+    __slots__ = ('url', 'final_url', 'depth', 'status_code', 'content_type', 'size', 'content_hash',
+                 'duplicate_of', 'parsed', 'error')
+    
+    def __init__(self, url, depth, final_url=None, status_code=None, content_type='', size=0,
+                 content_hash=None, duplicate_of=None, parsed=None, error=None):
+        self.url = url
+        self.final_url = final_url or url
+        self.depth = depth
+        self.status_code = status_code
+        self.content_type = content_type
+        self.size = size
+        self.content_hash = content_hash
+        self.duplicate_of = duplicate_of
+        self.parsed = parsed
+        self.error = error
+
+class Crawler:
+    """Breadth-first crawl restricted to an allowlisted host set
+
+    Fetches run on a thread pool with at most one request per host every
+    delay seconds (or the host's robots.txt Crawl-delay, if longer). Parsing
+    and fingerprinting run on a process pool, so CPU-bound work on one page
+    never waits behind the GIL held by another. Pages whose body hashes to
+    an already seen page are reported as duplicates and not parsed again.
+    """
+    def __init__(self, allowed_hosts, max_depth=2, max_pages=100, workers=8, delay=0.25,
+                 processes=None, respect_robots=True, timeout=10, max_bytes=2 * 1024 * 1024):
+        self.allowed_hosts = {host.lower().rstrip('.') for host in allowed_hosts}
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = max(1, workers)
+        self.delay = delay
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.respect_robots = respect_robots
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.robots = {}
+        self.next_request = {}
+        self.lock = threading.Lock()
+    
+    def allowed(self, url):
+        return (urlsplit(url).hostname or '').rstrip('.') in self.allowed_hosts
+    
+    def _robots(self, origin):
+        """RobotFileParser for an origin, fetched once; per-origin locks keep threads from fetching it twice"""
+        with self.lock:
+            entry = self.robots.get(origin)
+            if entry is None:
+                entry = self.robots[origin] = [threading.Lock(), None]
+        with entry[0]:
+            if entry[1] is None:
+                from http_layer import get_session
+                parser = RobotFileParser(origin + '/robots.txt')
+                try:
+                    response = get_session().get(origin + '/robots.txt', timeout=self.timeout)
+                    if response.status_code in (401, 403):
+                        parser.disallow_all = True
+                    elif response.status_code >= 400:
+                        parser.allow_all = True
+                    else:
+                        parser.parse(response.text.splitlines())
+                except Exception:
+                    # Unreachable robots.txt: crawl as if it were absent
+                    parser.allow_all = True
+                entry[1] = parser
+            return entry[1]
+    
+    def _wait_turn(self, host, delay):
+        """Reserve the next request slot for host and sleep until it comes"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request.get(host, now))
+            self.next_request[host] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _fetch(self, url):
+        """Download one page (HTML bodies only, capped at max_bytes); runs on the fetch pool"""
+        from http_layer import USER_AGENT, get_session
+        parts = urlsplit(url)
+        delay = self.delay
+        if self.respect_robots:
+            robots = self._robots(f'{parts.scheme}://{parts.netloc}')
+            if not robots.can_fetch(USER_AGENT, url):
+                return None
+            delay = max(delay, robots.crawl_delay(USER_AGENT) or 0)
+        self._wait_turn(parts.netloc, delay)
+        
+        token = METRICS.start('http')
+        try:
+            with get_session().get(url, timeout=self.timeout, stream=True) as response:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                body = bytearray()
+                if content_type in HTML_TYPES:
+                    for chunk in response.iter_content(64 * 1024):
+                        body += chunk
+                        if len(body) >= self.max_bytes:
+                            break
+                headers = {name.lower(): value for name, value in response.headers.items()}
+                result = (response.url, response.status_code, content_type, bytes(body[:self.max_bytes]), headers)
+        except Exception:
+            METRICS.stop(token, 'error')
+            raise
+        METRICS.stop(token, nbytes=len(result[3]))
+        return result
+    
+    def _parse_pool(self):
+        """Process pool for parsing, or a thread pool where processes are unavailable (e.g. Termux)"""
+        if self.processes > 0:
+            methods = multiprocessing.get_all_start_methods()
+            # Forking while fetch threads hold locks is unsafe, so workers come from a clean interpreter
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            try:
+                return concurrent.futures.ProcessPoolExecutor(self.processes, mp_context=context)
+            except (ImportError, NotImplementedError, OSError) as e:
+                print(f"   ⚠️ No process pool available ({e}); parsing on threads")
+        return concurrent.futures.ThreadPoolExecutor(max(1, self.processes))
+    
+    def crawl(self, seeds):
+        """Yield a CrawlPage for every URL fetched, as soon as it is parsed"""
+        frontier = deque()
+        seen = set()
+        hashes = {}
+        
+        def enqueue(url, depth):
+            if url and url not in seen and self.allowed(url):
+                seen.add(url)
+                frontier.append((url, depth))
+        
+        for seed in seeds:
+            enqueue(normalize_url(seed), 0)
+        
+        fetching, parsing = {}, {}
+        pages = 0
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as fetch_pool, self._parse_pool() as parse_pool:
+            while fetching or parsing or (frontier and pages < self.max_pages):
+                while frontier and pages < self.max_pages and len(fetching) < self.workers:
+                    url, depth = frontier.popleft()
+                    fetching[fetch_pool.submit(self._fetch, url)] = (url, depth)
+                    pages += 1
+                
+                done, _ = concurrent.futures.wait(list(fetching) + list(parsing),
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if future in parsing:
+                        page = parsing.pop(future)
+                        try:
+                            page.parsed = future.result()
+                        except Exception as e:
+                            page.error = f"parse failed: {e}"
+                            yield page
+                            continue
+                        if page.depth < self.max_depth:
+                            for link in page.parsed[0]['links']:
+                                enqueue(normalize_url(link, page.final_url), page.depth + 1)
+                        yield page
+                        continue
+                    
+                    url, depth = fetching.pop(future)
+                    try:
+                        fetched = future.result()
+                    except Exception as e:
+                        yield CrawlPage(url, depth, error=str(e) or type(e).__name__)
+                        continue
+                    if fetched is None:
+                        # Disallowed by robots.txt; it does not count against the page cap
+                        pages -= 1
+                        continue
+                    final_url, status, content_type, body, headers = fetched
+                    final_url = normalize_url(final_url) or url
+                    seen.add(final_url)
+                    page = CrawlPage(url, depth, final_url, status, content_type, len(body))
+                    if not body or not self.allowed(final_url):
+                        yield page
+                        continue
+                    page.content_hash = hashlib.sha256(body).hexdigest()
+                    page.duplicate_of = hashes.setdefault(page.content_hash, final_url)
+                    if page.duplicate_of != final_url:
+                        yield page
+                        continue
+                    page.duplicate_of = None
+                    parsing[parse_pool.submit(parse_page, body, headers, self.max_bytes)] = page
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Persistent TTL-aware DNS cache shared across runs
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+def default_cache_dir():
+    """Per-user cache directory (XDG_CACHE_HOME or ~/.cache)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'osint')
+
+class DNSCache:
+    """SQLite-backed DNS answer cache with TTL expiry and LRU eviction"""
+    def __init__(self, path=None, max_entries=200000):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'dns_cache.sqlite3')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.puts = 0
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS records (
+            name TEXT NOT NULL,
+            rtype TEXT NOT NULL,
+            answers TEXT NOT NULL,
+            error TEXT,
+            expires REAL NOT NULL,
+            used REAL NOT NULL,
+            PRIMARY KEY (name, rtype)
+        )''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS records_used ON records (used)')
+    
+    def get(self, name, rtype):
+        """Return (answers, error) for a live entry, or None on a miss"""
+        now = time.time()
+        key = (name.lower().rstrip('.'), rtype)
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT answers, error, expires FROM records WHERE name = ? AND rtype = ?', key
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] <= now:
+                self.conn.execute('DELETE FROM records WHERE name = ? AND rtype = ?', key)
+                return None
+            self.conn.execute('UPDATE records SET used = ? WHERE name = ? AND rtype = ?', (now,) + key)
+        return json.loads(row[0]), row[1]
+    
+    def put(self, name, rtype, answers, error, ttl):
+        """Store an answer (or negative answer) for ttl seconds"""
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)',
+                (name.lower().rstrip('.'), rtype, json.dumps(answers), error, now + ttl, now)
+            )
+            self.puts += 1
+            if self.puts % 1000 == 0:
+                self._evict()
+    
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones above the size cap"""
+        self.conn.execute('DELETE FROM records WHERE expires <= ?', (time.time(),))
+        self.conn.execute(
+            'DELETE FROM records WHERE rowid IN '
+            '(SELECT rowid FROM records ORDER BY used DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+    
+    def close(self):
+        with self.lock:
+            self._evict()
+            self.conn.close()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Asynchronous DNS resolution engine for the OSINT tool
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import random
+import string
+import time
+from collections import OrderedDict
+import dns.asyncresolver
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+from async_utils import adaptive_map, bounded_map, iterate_async
+from metrics import METRICS
+
+RECORD_TYPES = {
+    'A': 'IPv4 Address',
+    'AAAA': 'IPv6 Address',
+    'MX': 'Mail Exchange',
+    'NS': 'Name Server',
+    'TXT': 'Text Records',
+    'SOA': 'Start of Authority',
+    'CNAME': 'Canonical Name'
+}
+
+# Metrics outcome per query error; negative answers are successful lookups, anything unlisted is an error
+QUERY_OUTCOMES = {None: 'ok', 'NXDOMAIN': 'ok', 'NOANSWER': 'ok', 'TIMEOUT': 'timeout'}
+
+# Errors that mean the resolver is overloaded rather than that the name is missing; such queries are retried
+CONGESTION_ERRORS = {'TIMEOUT', 'SERVFAIL'}
+
+def iter_wordlist(path):
+    """Lazily read subdomain labels from a wordlist file"""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith('#'):
+                yield word
+
+def negative_ttl(responses, default=300):
+    """TTL for a negative answer: min(SOA TTL, SOA minimum) from the authority section"""
+    for response in responses:
+        for rrset in getattr(response, 'authority', []):
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum)
+    return default
+
+class NXDomainCache:
+    """Bounded LRU set of names that returned NXDOMAIN"""
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.names = OrderedDict()
+    
+    def add(self, name):
+        self.names[name] = True
+        self.names.move_to_end(name)
+        if len(self.names) > self.max_entries:
+            self.names.popitem(last=False)
+    
+    def covers(self, name, domain):
+        """True if name sits below a cached NXDOMAIN parent inside domain"""
+        labels = name[:-len(domain) - 1].split('.')
+        for i in range(1, len(labels)):
+            if '.'.join(labels[i:]) + '.' + domain in self.names:
+                return True
+        return False
+
+class AsyncDNSEngine:
+    """Asyncio DNS resolver; timeout bounds a whole query, attempt_timeout each datagram
+    
+    A query whose datagram or answer is lost is resent every attempt_timeout
+    (min(timeout / 4, 0.5) by default) until timeout runs out, so one dropped
+    packet does not turn a name that exists into a TIMEOUT.
+    """
+    def __init__(self, timeout=3.0, nameservers=None, port=53, cache=None, attempt_timeout=None):
+        self.timeout = timeout
+        self.attempt_timeout = attempt_timeout or min(timeout / 4, 0.5)
+        self.cache = cache
+        self.resolver = dns.asyncresolver.Resolver()
+        if nameservers:
+            self.resolver.nameservers = list(nameservers)
+        self.resolver.port = port
+        # query() times and resends each attempt itself, passing the attempt as the resolver's lifetime
+        self.resolver.timeout = timeout
+        self.resolver.lifetime = timeout
+    
+    async def query(self, name, rtype, use_cache=True, controller=None):
+        """Resolve a single record type, returning (answers, error)
+        
+        A controller, when given, sets the per-attempt timeout and is told about
+        every answer and congestion signal, including each lost attempt.
+        """
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            hit = cache.get(name, rtype)
+            if hit is not None:
+                return hit
+        
+        ttl = 0
+        token = METRICS.start('dns')
+        # A query cancelled mid-flight (the consumer stopped iterating) is still taken off the in-flight gauge
+        outcome = 'cancelled'
+        try:
+            deadline = time.perf_counter() + self.timeout
+            while True:
+                start = time.perf_counter()
+                attempt = min(controller.timeout() if controller else self.attempt_timeout, deadline - start)
+                try:
+                    answer = await self.resolver.resolve(name, rtype, lifetime=attempt)
+                    records, error = [rdata.to_text() for rdata in answer], None
+                    ttl = answer.expiration - time.time()
+                except dns.resolver.NXDOMAIN as e:
+                    records, error = [], 'NXDOMAIN'
+                    ttl = negative_ttl(e.responses().values())
+                except dns.resolver.NoAnswer as e:
+                    records, error = [], 'NOANSWER'
+                    ttl = negative_ttl([e.response()])
+                except dns.exception.Timeout:
+                    records, error = [], 'TIMEOUT'
+                except dns.resolver.NoNameservers:
+                    records, error = [], 'SERVFAIL'
+                except Exception as e:
+                    records, error = [], f'ERROR: {e}'
+                if error != 'TIMEOUT' or time.perf_counter() >= deadline:
+                    break
+                # The datagram or its answer was lost; resend while the query's lifetime allows
+                if controller is not None:
+                    controller.congestion()
+            outcome = QUERY_OUTCOMES.get(error, 'error')
+        finally:
+            METRICS.stop(token, outcome)
+        if controller is not None:
+            if error in CONGESTION_ERRORS:
+                controller.congestion()
+            else:
+                controller.observe(time.perf_counter() - start)
+        
+        # Timeouts and server failures are never cached
+        if cache is not None and ttl > 0:
+            cache.put(name, rtype, records, error, ttl)
+        return records, error
+    
+    async def resolve_domain(self, domain, record_types=None):
+        """Query every record type for a domain at once"""
+        if record_types is None:
+            record_types = list(RECORD_TYPES)
+        
+        start = time.perf_counter()
+        answers = await asyncio.gather(*(self.query(domain, rtype) for rtype in record_types))
+        
+        result = {'domain': domain, 'records': {}, 'errors': {}}
+        for rtype, (records, error) in zip(record_types, answers):
+            if records:
+                result['records'][rtype] = records
+            else:
+                result['errors'][rtype] = error
+        result['elapsed'] = time.perf_counter() - start
+        return result
+    
+    async def resolve_domains(self, domains, record_types=None, concurrency=50):
+        """Resolve many domains under one shared concurrency limit"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def limited(domain):
+            async with semaphore:
+                return await self.resolve_domain(domain, record_types)
+        
+        return await asyncio.gather(*(limited(domain) for domain in domains))
+    
+    async def detect_wildcard(self, domain, probes=3):
+        """Resolve random labels and return the wildcard answer set (empty if none)"""
+        labels = [''.join(random.choices(string.ascii_lowercase + string.digits, k=16)) for _ in range(probes)]
+        answers = await asyncio.gather(*(self.query(f"{label}.{domain}", 'A', use_cache=False) for label in labels))
+        
+        wildcard = set()
+        for ips, error in answers:
+            wildcard.update(ips)
+        return frozenset(wildcard)
+    
+    async def stream_subdomains(self, domain, words, concurrency=100, wildcard=frozenset(), controller=None):
+        """Yield (name, ips, status) for every candidate label, keeping a bounded number of queries in flight
+        
+        status is 'found', 'missing', 'wildcard' (answers match the wildcard set)
+        or 'nxparent' (skipped because a parent label returned NXDOMAIN). The skip
+        only applies when the parent comes earlier in words or is still in flight;
+        a child such as a.b listed before b is queried anyway, so how many names
+        are skipped depends on wordlist order. With a
+        controller, the number in flight follows its window instead of concurrency,
+        and timed-out or SERVFAIL names are queried once more before being reported missing.
+        """
+        nx_cache = NXDomainCache()
+        in_flight = {}
+        
+        async def check(word):
+            name = f"{word}.{domain}"
+            if '.' in word:
+                # Wait for any parent still being resolved so its NXDOMAIN can short-circuit us
+                labels = word.split('.')
+                for i in range(1, len(labels)):
+                    parent = in_flight.get('.'.join(labels[i:]) + '.' + domain)
+                    if parent is not None:
+                        await asyncio.shield(parent)
+                if nx_cache.covers(name, domain):
+                    return name, [], 'nxparent'
+            
+            query = in_flight.get(name)
+            if query is not None:
+                # A duplicate word shares the answer of the copy already being resolved
+                ips, error = await asyncio.shield(query)
+            else:
+                query = in_flight[name] = asyncio.ensure_future(self.query(name, 'A', controller=controller))
+                try:
+                    ips, error = await query
+                finally:
+                    if in_flight.get(name) is query:
+                        del in_flight[name]
+            if error == 'NXDOMAIN':
+                nx_cache.add(name)
+            if not ips:
+                return name, ips, 'dropped' if error in CONGESTION_ERRORS else 'missing'
+            if wildcard and wildcard.issuperset(ips):
+                return name, ips, 'wildcard'
+            return name, ips, 'found'
+        
+        if controller is None:
+            results = bounded_map(check, words, concurrency)
+        else:
+            results = adaptive_map(check, words, controller, lambda result: result[2] == 'dropped')
+        async for result in results:
+            # Out of retries: the name is reported missing, as it always was
+            yield result if result[2] != 'dropped' else (result[0], result[1], 'missing')
+    
+    def lookup(self, name, rtype):
+        """Blocking wrapper around query"""
+        return asyncio.run(self.query(name, rtype))
+    
+    def resolve(self, domain, record_types=None):
+        """Blocking wrapper around resolve_domain"""
+        return asyncio.run(self.resolve_domain(domain, record_types))
+    
+    def resolve_many(self, domains, record_types=None, concurrency=50):
+        """Blocking wrapper around resolve_domains"""
+        return asyncio.run(self.resolve_domains(domains, record_types, concurrency))
+    
+    def wildcard_answers(self, domain, probes=3):
+        """Blocking wrapper around detect_wildcard"""
+        return asyncio.run(self.detect_wildcard(domain, probes))
+    
+    def iter_subdomains(self, domain, words, concurrency=100, wildcard=frozenset(), controller=None):
+        """Blocking generator around stream_subdomains"""
+        return iterate_async(self.stream_subdomains(domain, words, concurrency, wildcard, controller))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Compiled single-pass technology fingerprint engine
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import codecs
+import json
+import os
+import re
+from metrics import METRICS
+
+DEFAULT_SIGNATURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fingerprints.json')
+
+SCRIPT_SRC = re.compile(r'''<script\b[^>]*?\bsrc\s*=\s*["']?([^"'\s>]+)''', re.IGNORECASE)
+COOKIE_NAME = re.compile(r'(?:^|,\s*)([^=;,\s]+)=')
+
+# Regex matches are assumed to span at most this many characters across chunk boundaries
+REGEX_OVERLAP = 256
+
+_default_engine = None
+
+def _trie_pattern(words):
+    """Build a regex matching any of words, structured as a trie so each position is tried once"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        if list(node) == ['']:
+            return ''
+        alternatives, single_chars = [], []
+        for char in sorted(key for key in node if key):
+            rest = build(node[char])
+            if rest:
+                alternatives.append(re.escape(char) + rest)
+            else:
+                single_chars.append(re.escape(char))
+        if single_chars:
+            alternatives.append(single_chars[0] if len(single_chars) == 1 else '[' + ''.join(single_chars) + ']')
+        pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if '' in node:
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+    
+    return build(trie)
+
+def _combined(patterns, flags=re.IGNORECASE):
+    """One alternation of (signature index, regex) pairs, returned as (regex, owners)
+    
+    Each alternative is wrapped in a named group p<n>, so a match's lastgroup
+    maps back to its signature through owners[n].
+    """
+    if not patterns:
+        return None
+    regex = re.compile('|'.join(f'(?P<p{n}>{pattern})' for n, (index, pattern) in enumerate(patterns)), flags)
+    return regex, [index for index, pattern in patterns]
+
+class FingerprintEngine:
+    def __init__(self, signatures):
+        self.signatures = signatures
+        
+        literals = {}
+        body_patterns, cookie_patterns, script_patterns = [], [], []
+        header_patterns = {}
+        for index, signature in enumerate(signatures):
+            for literal in signature.get('body', []):
+                literals.setdefault(literal.lower(), set()).add(index)
+            body_patterns.extend((index, pattern) for pattern in signature.get('body_regex', []))
+            cookie_patterns.extend((index, pattern) for pattern in signature.get('cookies', []))
+            script_patterns.extend((index, pattern) for pattern in signature.get('script_src', []))
+            for header, pattern in signature.get('headers', {}).items():
+                header_patterns.setdefault(header.lower(), []).append((index, pattern))
+        
+        self.literals = literals
+        self.literal_lengths = sorted({len(literal) for literal in literals})
+        self.max_literal = self.literal_lengths[-1] if literals else 0
+        # Literals are matched against lowercased text; the trie makes each attempt a single walk
+        self.literal_re = re.compile(_trie_pattern(literals)) if literals else None
+        self.body_re = _combined(body_patterns)
+        self.cookie_re = _combined([(index, '^(?:' + pattern + ')') for index, pattern in cookie_patterns], 0)
+        self.script_re = _combined(script_patterns)
+        self.header_res = {header: _combined(patterns) for header, patterns in header_patterns.items()}
+    
+    @classmethod
+    def load(cls, path=None):
+        """Compile an engine from a JSON signature file"""
+        with open(path or DEFAULT_SIGNATURES, encoding='utf-8') as f:
+            return cls(json.load(f)['signatures'])
+    
+    def _literal_hits(self, text, hits):
+        if self.literal_re is None:
+            return
+        text = text.lower()
+        regex = self.literal_re
+        for match in regex.finditer(text):
+            self._record_literal(match.group(), hits)
+            # finditer resumes after a match, so literals starting inside it are tried here
+            for position in range(match.start() + 1, match.end()):
+                inner = regex.match(text, position)
+                if inner:
+                    self._record_literal(inner.group(), hits)
+    
+    def _record_literal(self, found, hits):
+        # The trie prefers the longest literal; shorter literals that prefix it matched too
+        for length in self.literal_lengths:
+            if length > len(found):
+                break
+            indexes = self.literals.get(found[:length])
+            if indexes:
+                hits.update(indexes)
+    
+    @staticmethod
+    def _regex_hits(matcher, text, hits):
+        if matcher is not None:
+            regex, owners = matcher
+            for match in regex.finditer(text):
+                hits.add(owners[int(match.lastgroup[1:])])
+    
+    def scan_body(self, text, hits=None):
+        """Return the indexes of signatures whose body matchers fire, in one pass per matcher kind"""
+        hits = set() if hits is None else hits
+        self._literal_hits(text, hits)
+        self._regex_hits(self.body_re, text, hits)
+        if self.script_re is not None:
+            for src in SCRIPT_SRC.findall(text):
+                self._regex_hits(self.script_re, src, hits)
+        return hits
+    
+    def scan_headers(self, headers, hits=None):
+        """Return the indexes of signatures whose header or cookie matchers fire"""
+        hits = set() if hits is None else hits
+        for header, matcher in self.header_res.items():
+            value = headers.get(header)
+            if value is not None:
+                self._regex_hits(matcher, value, hits)
+        if self.cookie_re is not None:
+            for name in COOKIE_NAME.findall(headers.get('set-cookie', '')):
+                self._regex_hits(self.cookie_re, name, hits)
+        return hits
+    
+    def match(self, body, headers=None):
+        """Return [(name, category)] for every signature found in a complete response"""
+        token = METRICS.start('parse.fingerprint')
+        hits = self.scan_body(body)
+        if headers is not None:
+            self.scan_headers(headers, hits)
+        METRICS.stop(token, nbytes=len(body))
+        return self.describe(hits)
+    
+    def describe(self, hits):
+        return [(self.signatures[i]['name'], self.signatures[i].get('category', 'Other')) for i in sorted(hits)]
+    
+    def stream(self, headers=None, encoding='utf-8'):
+        """Incremental scanner that matches chunks as they arrive"""
+        return FingerprintStream(self, headers, encoding)
+
+class FingerprintStream:
+    """Feeds body chunks through an engine, keeping just enough overlap to catch matches split across chunks"""
+    def __init__(self, engine, headers=None, encoding='utf-8'):
+        self.engine = engine
+        self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self.overlap = max(engine.max_literal - 1, REGEX_OVERLAP)
+        self.tail = ''
+        self.hits = set()
+        if headers is not None:
+            engine.scan_headers(headers, self.hits)
+    
+    def feed(self, chunk):
+        """Scan a bytes or str chunk, returning [(name, category)] newly detected by it"""
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+        window = self.tail + chunk
+        before = set(self.hits)
+        self.engine.scan_body(window, self.hits)
+        self.tail = window[-self.overlap:]
+        return self.engine.describe(self.hits - before)
+    
+    def close(self):
+        """Flush the decoder and return every detection"""
+        self.feed(self.decoder.decode(b'', final=True))
+        return self.engine.describe(self.hits)
+
+def default_engine():
+    """Engine for the bundled signatures, compiled once per process"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = FingerprintEngine.load()
+    return _default_engine
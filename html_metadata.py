@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Streaming, size-capped HTML metadata extraction
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+from lxml import etree
+from metrics import METRICS
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+class MetadataCollector:
+    """lxml parser target that keeps only meta, stylesheet, script, image and link tags"""
+    def __init__(self):
+        self.meta = {}
+        self.stylesheets = []
+        self.scripts = []
+        self.images = []
+        self.links = []
+        self.head_closed = False
+    
+    def start(self, tag, attrib):
+        if tag == 'meta':
+            name = attrib.get('name') or attrib.get('property') or attrib.get('http-equiv')
+            content = attrib.get('content')
+            if name and content:
+                self.meta[name] = content
+        elif tag == 'link':
+            if 'stylesheet' in attrib.get('rel', '').lower().split() and attrib.get('href'):
+                self.stylesheets.append(attrib['href'])
+        elif tag == 'script':
+            if attrib.get('src'):
+                self.scripts.append(attrib['src'])
+        elif tag == 'img':
+            if attrib.get('src'):
+                self.images.append(attrib['src'])
+        elif tag in ('a', 'area'):
+            if attrib.get('href'):
+                self.links.append(attrib['href'])
+        elif tag == 'body':
+            self.head_closed = True
+    
+    def end(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+    
+    def data(self, data):
+        pass
+    
+    def close(self):
+        return self
+
+def iter_chunks(content, size=CHUNK_SIZE):
+    """Slice an already downloaded body into parser-sized chunks"""
+    for offset in range(0, len(content), size):
+        yield content[offset:offset + size]
+
+def extract_metadata(chunks, head_only=False, max_bytes=DEFAULT_MAX_BYTES):
+    """Feed body chunks through an incremental parser and return the collected tags
+
+    Parsing stops after </head> when head_only is set, and after max_bytes in any case.
+    """
+    token = METRICS.start('parse.metadata')
+    collector = MetadataCollector()
+    parser = etree.HTMLParser(target=collector)
+    read = 0
+    truncated = False
+    
+    for chunk in chunks:
+        if read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - read]
+            truncated = True
+        if chunk:
+            parser.feed(chunk)
+            read += len(chunk)
+        if truncated or (head_only and collector.head_closed):
+            break
+    
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Empty or cut-off documents are expected when stopping early
+        pass
+    METRICS.stop(token, nbytes=read)
+    
+    return {
+        'meta': collector.meta,
+        'stylesheets': collector.stylesheets,
+        'scripts': collector.scripts,
+        'images': collector.images,
+        'links': collector.links,
+        'bytes_read': read,
+        'truncated': truncated,
+    }
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Shared fetch-once HTTP layer for the web analyzers
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import threading
+import time
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from async_http import USER_AGENT
+from metrics import METRICS
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Process-wide requests session, so every analyzer shares one connection pool"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+class FetchedResponse:
+    """Immutable snapshot of a downloaded page, mirroring the requests.Response attributes analyzers use"""
+    __slots__ = ('requested_url', 'url', 'status_code', 'headers', 'content', 'encoding', 'elapsed')
+    
+    def __init__(self, requested_url, url, status_code, headers, content, encoding, elapsed):
+        self.requested_url = requested_url
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.elapsed = elapsed
+    
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+class ResponseCache:
+    """Fetch-once cache of HTTP responses, bounded by entry count and total body size"""
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+    
+    def get(self, url):
+        """Return the cached response for url, or None"""
+        with self.lock:
+            response = self.entries.get(url)
+            if response is not None:
+                self.entries.move_to_end(url)
+            return response
+    
+    def fetch(self, url, timeout=15, headers=None):
+        """Return the response for url, downloading it only if no analyzer has yet
+
+        headers turns the download into a conditional request (If-None-Match /
+        If-Modified-Since); a 304 answer has an empty body and is not cached.
+        """
+        if headers:
+            return self._download(url, timeout, headers)
+        
+        with self.lock:
+            response = self.entries.get(url)
+            if response is not None:
+                self.entries.move_to_end(url)
+                return response
+            # Concurrent callers for the same URL wait for the first download
+            event = self.in_flight.get(url)
+            owner = event is None
+            if owner:
+                event = self.in_flight[url] = threading.Event()
+        
+        if not owner:
+            event.wait()
+            return self.fetch(url, timeout)
+        
+        try:
+            return self._download(url, timeout)
+        finally:
+            with self.lock:
+                del self.in_flight[url]
+            event.set()
+    
+    def _download(self, url, timeout, headers=None):
+        token = METRICS.start('http')
+        try:
+            start = time.perf_counter()
+            raw = get_session().get(url, timeout=timeout, allow_redirects=True, headers=headers)
+            response = FetchedResponse(url, raw.url, raw.status_code, raw.headers,
+                                       raw.content, raw.encoding, time.perf_counter() - start)
+        except requests.Timeout:
+            METRICS.stop(token, 'timeout')
+            raise
+        except Exception:
+            METRICS.stop(token, 'error')
+            raise
+        METRICS.stop(token, nbytes=len(response.content))
+        if response.status_code != 304:
+            self.put(url, response)
+        return response
+    
+    def put(self, url, response):
+        with self.lock:
+            previous = self.entries.pop(url, None)
+            if previous is not None:
+                self.total_bytes -= len(previous.content)
+            if len(response.content) > self.max_bytes:
+                return
+            self.entries[url] = response
+            self.total_bytes += len(response.content)
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted.content)
+
+RESPONSES = ResponseCache()
+
+def fetch(url, timeout=15, headers=None):
+    """Fetch url through the shared process-wide response cache"""
+    return RESPONSES.fetch(url, timeout, headers)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Offline IP range index for ASN/country lookups
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import ipaddress
+import socket
+from array import array
+from bisect import bisect_right
+
+def _to_int(value):
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    return int(ipaddress.ip_address(value))
+
+class IPRangeIndex:
+    """Sorted, array-backed interval index answering lookups by binary search
+
+    Range files are CSV or TSV rows of: start, end, asn, country, description
+    (the layout of iptoasn.com dumps). Start and end may be addresses or integers.
+    """
+    def __init__(self):
+        self.meta = []
+        self.v4_starts, self.v4_ends, self.v4_meta = array('L'), array('L'), array('L')
+        # 128-bit bounds do not fit an array typecode, so IPv6 keeps Python ints
+        self.v6_starts, self.v6_ends, self.v6_meta = [], [], array('L')
+    
+    @classmethod
+    def load(cls, path):
+        """Build an index from a CSV/TSV range file"""
+        index = cls()
+        meta_ids = {}
+        v4_rows, v6_rows = [], []
+        
+        with open(path, encoding='utf-8', errors='replace') as f:
+            delimiter = None
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line or line.startswith('#'):
+                    continue
+                if delimiter is None:
+                    delimiter = '\t' if '\t' in line else ','
+                fields = line.split(delimiter, 4)
+                if len(fields) < 4:
+                    continue
+                try:
+                    start, end = _to_int(fields[0]), _to_int(fields[1])
+                except ValueError:
+                    # Header rows and malformed lines
+                    continue
+                description = fields[4].strip().strip('"') if len(fields) > 4 else ''
+                key = (fields[2].strip(), fields[3].strip(), description)
+                meta_id = meta_ids.setdefault(key, len(meta_ids))
+                rows = v6_rows if ':' in fields[0] or end > 0xFFFFFFFF else v4_rows
+                rows.append((start, end, meta_id))
+        
+        index.meta = [None] * len(meta_ids)
+        for (asn, country, description), meta_id in meta_ids.items():
+            index.meta[meta_id] = {'asn': asn, 'country': country, 'org': description}
+        
+        for rows, starts, ends, metas in ((v4_rows, index.v4_starts, index.v4_ends, index.v4_meta),
+                                          (v6_rows, index.v6_starts, index.v6_ends, index.v6_meta)):
+            rows.sort()
+            for start, end, meta_id in rows:
+                starts.append(start)
+                ends.append(end)
+                metas.append(meta_id)
+        return index
+    
+    def __len__(self):
+        return len(self.v4_starts) + len(self.v6_starts)
+    
+    def lookup(self, ip):
+        """Return {'asn', 'country', 'org'} for ip, or None if no range covers it"""
+        # inet_pton is several times cheaper than building ipaddress objects
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+            starts, ends, metas = self.v4_starts, self.v4_ends, self.v4_meta
+        except OSError:
+            value = int(ipaddress.IPv6Address(ip))
+            starts, ends, metas = self.v6_starts, self.v6_ends, self.v6_meta
+        position = bisect_right(starts, value) - 1
+        if position >= 0 and value <= ends[position]:
+            return self.meta[metas[position]]
+        return None
+    
+    def lookup_many(self, ips):
+        """Yield (ip, info) for every address in ips"""
+        for ip in ips:
+            try:
+                yield ip, self.lookup(ip)
+            except ValueError:
+                yield ip, None
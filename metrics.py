@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and metrics instrumentation (--profile)
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+
+# Log-spaced latency buckets from 0.1 ms to about 100 s; constant memory however many samples arrive
+BUCKETS = tuple(0.0001 * 1.5 ** i for i in range(35))
+
+# The scan target that low-level operations (DNS queries, connects, fetches) are attributed to
+_target = contextvars.ContextVar('osint_metrics_target', default='*')
+
+class Stat:
+    __slots__ = ('count', 'timeouts', 'errors', 'cancelled', 'bytes', 'seconds', 'fastest', 'slowest',
+                 'inflight', 'peak_inflight', 'buckets')
+    
+    def __init__(self):
+        self.count = self.timeouts = self.errors = self.cancelled = self.bytes = 0
+        self.seconds = 0.0
+        self.fastest = float('inf')
+        self.slowest = 0.0
+        self.inflight = self.peak_inflight = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+    
+    def record(self, elapsed, outcome, nbytes):
+        self.inflight -= 1
+        if outcome == 'cancelled':
+            # Abandoned before it finished, so its duration says nothing about latency
+            self.cancelled += 1
+            return
+        self.count += 1
+        self.seconds += elapsed
+        self.bytes += nbytes
+        self.fastest = min(self.fastest, elapsed)
+        self.slowest = max(self.slowest, elapsed)
+        if outcome == 'timeout':
+            self.timeouts += 1
+        elif outcome == 'error':
+            self.errors += 1
+        self.buckets[bisect_left(BUCKETS, elapsed)] += 1
+    
+    def quantile(self, q):
+        """Estimate a latency quantile by interpolating inside its histogram bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, in_bucket in enumerate(self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.slowest
+                estimate = lower + (upper - lower) * (rank - seen) / in_bucket
+                # The observed extremes are exact, so never report beyond them
+                return min(max(estimate, self.fastest), self.slowest)
+            seen += in_bucket
+        return self.slowest
+    
+    def summary(self):
+        return {
+            'count': self.count,
+            'p50_ms': round(self.quantile(0.50) * 1000, 2),
+            'p95_ms': round(self.quantile(0.95) * 1000, 2),
+            'p99_ms': round(self.quantile(0.99) * 1000, 2),
+            'total_s': round(self.seconds, 3),
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'bytes': self.bytes,
+            'peak_inflight': self.peak_inflight,
+        }
+
+class _Span:
+    """Times a whole module call and attributes nested operations to its target"""
+    __slots__ = ('metrics', 'stage', 'target', 'token', 'context_token')
+    
+    def __init__(self, metrics, stage, target):
+        self.metrics = metrics
+        self.stage = stage
+        self.target = target
+    
+    def __enter__(self):
+        self.context_token = _target.set(self.target)
+        self.token = self.metrics.start(self.stage)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        self.metrics.stop(self.token, 'error' if failed else 'ok')
+        _target.reset(self.context_token)
+
+class _NullSpan:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Metrics:
+    """Counters and latency histograms keyed by (stage, target)
+
+    Disabled by default: start() then returns None and stop(None) returns at once,
+    so instrumented hot paths pay two cheap calls and no locking.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+    
+    def enable(self):
+        self.enabled = True
+        self.started = time.time()
+    
+    def reset(self):
+        """Drop every series, e.g. between benchmark scenarios"""
+        with self.lock:
+            self.stats.clear()
+        self.started = time.time()
+    
+    def stat(self, stage):
+        """Merge a stage's series across targets into one Stat"""
+        merged = Stat()
+        with self.lock:
+            for (name, target), stat in self.stats.items():
+                if name != stage:
+                    continue
+                for field in ('count', 'timeouts', 'errors', 'cancelled', 'bytes', 'seconds', 'inflight'):
+                    setattr(merged, field, getattr(merged, field) + getattr(stat, field))
+                merged.fastest = min(merged.fastest, stat.fastest)
+                merged.slowest = max(merged.slowest, stat.slowest)
+                merged.peak_inflight = max(merged.peak_inflight, stat.peak_inflight)
+                merged.buckets = [a + b for a, b in zip(merged.buckets, stat.buckets)]
+        return merged
+    
+    def start(self, stage):
+        """Begin timing one operation, returning a token for stop()"""
+        if not self.enabled:
+            return None
+        key = (stage, _target.get())
+        with self.lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                stat = self.stats[key] = Stat()
+            stat.inflight += 1
+            if stat.inflight > stat.peak_inflight:
+                stat.peak_inflight = stat.inflight
+        return stat, time.perf_counter()
+    
+    def stop(self, token, outcome='ok', nbytes=0):
+        """Finish an operation; outcome is 'ok', 'timeout', 'error' or 'cancelled'"""
+        if token is None:
+            return
+        stat, started = token
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            stat.record(elapsed, outcome, nbytes)
+    
+    def stage(self, stage, target):
+        """Context manager timing a module call against a target"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, str(target))
+    
+    def summary(self):
+        """JSON-ready {'stages': {stage: {target: stats}}}"""
+        stages = {}
+        with self.lock:
+            for (stage, target), stat in sorted(self.stats.items()):
+                stages.setdefault(stage, {})[target] = stat.summary()
+        return {'elapsed_s': round(time.time() - self.started, 3), 'stages': stages}
+    
+    def prometheus(self):
+        """Render every series in the Prometheus text exposition format"""
+        def labels(stage, target, **extra):
+            pairs = dict(stage=stage, target=target, **extra)
+            escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in pairs.values())
+            return '{' + ','.join(f'{k}="{v}"' for k, v in zip(pairs, escaped)) + '}'
+        
+        with self.lock:
+            items = sorted(self.stats.items())
+            lines = ['# HELP osint_stage_seconds Latency of instrumented operations',
+                     '# TYPE osint_stage_seconds histogram']
+            for (stage, target), stat in items:
+                cumulative = 0
+                for bound, in_bucket in zip(BUCKETS, stat.buckets):
+                    cumulative += in_bucket
+                    lines.append(f'osint_stage_seconds_bucket{labels(stage, target, le=f"{bound:.6g}")} {cumulative}')
+                lines.append(f'osint_stage_seconds_bucket{labels(stage, target, le="+Inf")} {stat.count}')
+                lines.append(f'osint_stage_seconds_sum{labels(stage, target)} {stat.seconds:.6f}')
+                lines.append(f'osint_stage_seconds_count{labels(stage, target)} {stat.count}')
+            for name, kind, attribute, description in (
+                ('osint_stage_timeouts_total', 'counter', 'timeouts', 'Operations that timed out'),
+                ('osint_stage_errors_total', 'counter', 'errors', 'Operations that failed'),
+                ('osint_stage_cancelled_total', 'counter', 'cancelled', 'Operations abandoned before they finished'),
+                ('osint_stage_bytes_total', 'counter', 'bytes', 'Bytes transferred or parsed'),
+                ('osint_stage_inflight', 'gauge', 'inflight', 'Operations currently in flight'),
+            ):
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} {kind}')
+                for (stage, target), stat in items:
+                    lines.append(f'{name}{labels(stage, target)} {getattr(stat, attribute)}')
+        return '\n'.join(lines) + '\n'
+    
+    def serve(self, port, host='127.0.0.1'):
+        """Expose /metrics for Prometheus scrapes from a daemon thread"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+METRICS = Metrics()
+
+def instrumented(stage, label=None):
+    """Decorate a tool method so each call is timed as stage against its target
+
+    The target is the first argument, or label(*args) when given. Generator
+    methods are timed until they are exhausted or closed.
+    """
+    def decorate(method):
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                if not METRICS.enabled:
+                    return (yield from method(self, *args, **kwargs))
+                with METRICS.stage(stage, label(*args) if label else args[0]):
+                    return (yield from method(self, *args, **kwargs))
+        else:
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                if not METRICS.enabled:
+                    return method(self, *args, **kwargs)
+                with METRICS.stage(stage, label(*args) if label else args[0]):
+                    return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
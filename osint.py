@@ -4,24 +4,96 @@ Educational OSINT Tool for Cybersecurity Learning
 ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
 """
 
-import os
+# Heavy dependencies (requests, dnspython, lxml) are imported by the methods that
+# use them, so short runs such as a single port scan start quickly
 import sys
-import requests
 import json
 import socket
 import time
-import dns.resolver
+from checkpoint import Checkpoint, Progress, default_checkpoint_path, scan_key
+from metrics import METRICS, instrumented
+from records import (Account, Certificate, DNSAnswer, HTTPFinding, IPInfo, JSONLWriter, OpenPort,
+                     RecordEmitter, ScanError, Subdomain, to_jsonable)
+import functools
+from collections import deque
+import importlib.util
+import ipaddress
 from urllib.parse import urlparse
-import concurrent.futures
 import argparse
 
-class OSINTTool:
+# Target kinds each module accepts in batch mode
+BATCH_MODULES = {
+    'recon': ('domain',),
+    'subdomains': ('domain',),
+    'ports': ('domain', 'ip'),
+    'ip': ('ip',),
+    'web': ('domain', 'url'),
+}
+
+def classify_target(target):
+    """Return (kind, host) for a domain, IP address or URL target"""
+    if target.startswith(('http://', 'https://')):
+        return 'url', urlparse(target).hostname
+    try:
+        ipaddress.ip_address(target)
+        return 'ip', target
+    except ValueError:
+        return 'domain', target.lower()
+
+class OSINTTool(RecordEmitter):
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.ip_api_url = 'http://ip-api.com'
+        self.ip_index = None
+        self.ip_index_path = None
+        self.checkpoint = Checkpoint()
+        self.use_dns_cache = True
+        self.adaptive = False
+        self._dns = None
+    
+    @property
+    def session(self):
+        from http_layer import get_session
+        return get_session()
+    
+    @property
+    def dns(self):
+        """Async DNS engine, created on first use so runs without DNS never import dnspython"""
+        if self._dns is None:
+            from dns_engine import AsyncDNSEngine
+            self._dns = AsyncDNSEngine(cache=self._open_dns_cache() if self.use_dns_cache else None)
+        return self._dns
+    
+    @dns.setter
+    def dns(self, engine):
+        self._dns = engine
         
+    def _open_dns_cache(self):
+        """Open the persistent DNS cache, running uncached if it is unavailable"""
+        try:
+            from dns_cache import DNSCache
+            return DNSCache()
+        except Exception as e:
+            print(f"⚠️ DNS cache disabled: {e}")
+            return None
+    
+    def resolve_host(self, host):
+        """Resolve a hostname to its first IPv4 address through the cached DNS engine"""
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        
+        ips, error = self.dns.lookup(host, 'A')
+        if ips:
+            return ips[0]
+        
+        # Names like localhost only exist in the hosts file
+        try:
+            return socket.gethostbyname(host)
+        except socket.gaierror:
+            return None
+    
     def display_banner(self):
         print("""
 ╔══════════════════════════════════════════════════════════════╗
@@ -34,18 +106,11 @@ class OSINTTool:
         """)
     
     def check_dependencies(self):
-        """Check if required packages are installed"""
-        required_modules = ['requests', 'dns.resolver']
-        missing = []
-        
-        for module in required_modules:
-            try:
-                if module == 'dns.resolver':
-                    import dns.resolver
-                else:
-                    __import__(module)
-            except ImportError:
-                missing.append(module)
+        """Check if required packages are installed, without importing them"""
+        # find_spec on a dotted name would import its parent package, so only top-level names are checked
+        required_modules = {'requests': 'requests', 'dns': 'dnspython', 'lxml': 'lxml'}
+        missing = [package for module, package in required_modules.items()
+                   if importlib.util.find_spec(module) is None]
         
         if missing:
             print(f"❌ Missing dependencies: {', '.join(missing)}")
@@ -53,45 +118,69 @@ class OSINTTool:
             return False
         return True
     
+    @instrumented('recon')
     def domain_reconnaissance(self, domain):
         """Comprehensive domain information gathering"""
         print(f"\n🔍 [DOMAIN RECON] Gathering information for: {domain}")
         
         try:
-            # Basic DNS resolution
-            print(f"\n📡 DNS Information:")
-            ip = socket.gethostbyname(domain)
-            print(f"   IP Address: {ip}")
-            
-            # Various DNS record types
-            record_types = {
-                'A': 'IPv4 Address',
-                'AAAA': 'IPv6 Address', 
-                'MX': 'Mail Exchange',
-                'NS': 'Name Server',
-                'TXT': 'Text Records',
-                'SOA': 'Start of Authority',
-                'CNAME': 'Canonical Name'
-            }
-            
-            for rtype, description in record_types.items():
-                try:
-                    answers = dns.resolver.resolve(domain, rtype)
-                    print(f"\n   {description} ({rtype}):")
-                    for rdata in answers:
-                        print(f"     → {rdata}")
-                except Exception as e:
-                    print(f"   {description} ({rtype}): Not found")
+            # All record types are queried concurrently
+            result = self.dns.resolve(domain)
+            self._print_dns_result(result)
+            return self.track(scan_key('dns', domain), self._dns_records(result))
                     
         except Exception as e:
             print(f"❌ Error in domain reconnaissance: {e}")
+            return []
+    
+    @instrumented('recon', label=lambda domains, *args: f"{len(domains)} domains")
+    def domain_reconnaissance_bulk(self, domains, concurrency=50):
+        """Resolve a list of domains under one concurrency limit"""
+        print(f"\n🔍 [DOMAIN RECON] Resolving {len(domains)} domains...")
+        
+        try:
+            records = []
+            for result in self.dns.resolve_many(domains, concurrency=concurrency):
+                print(f"\n🌐 {result['domain']}")
+                self._print_dns_result(result)
+                records.extend(self.track(scan_key('dns', result['domain']), self._dns_records(result)))
+            return records
+            
+        except Exception as e:
+            print(f"❌ Error in domain reconnaissance: {e}")
+            return []
     
+    def _dns_records(self, result):
+        """Flatten a DNS result into emitted DNSAnswer records"""
+        return [self.emit(DNSAnswer(result['domain'], rtype, value))
+                for rtype, values in result['records'].items() for value in values]
+    
+    def _print_dns_result(self, result):
+        """Print a structured DNS result"""
+        from dns_engine import RECORD_TYPES
+        
+        print(f"\n📡 DNS Information:")
+        ips = result['records'].get('A', [])
+        print(f"   IP Address: {ips[0] if ips else 'Not resolved'}")
+        
+        for rtype, description in RECORD_TYPES.items():
+            records = result['records'].get(rtype)
+            if records:
+                print(f"\n   {description} ({rtype}):")
+                for rdata in records:
+                    print(f"     → {rdata}")
+            elif rtype in result['errors']:
+                print(f"   {description} ({rtype}): Not found")
+        
+        print(f"\n   ⏱️ Resolved in {result['elapsed']:.2f}s")
+    
+    @instrumented('ip')
     def ip_intelligence(self, ip):
         """IP address information and geolocation"""
         print(f"\n🌐 [IP INTELLIGENCE] Lookup for: {ip}")
         
         try:
-            response = self.session.get(f"http://ip-api.com/json/{ip}", timeout=10)
+            response = self.session.get(f"{self.ip_api_url}/json/{ip}", timeout=10)
             data = response.json()
             
             if data['status'] == 'success':
@@ -109,13 +198,79 @@ class OSINTTool:
                 
                 print(f"\n🌍 Timezone:")
                 print(f"   Timezone: {data.get('timezone', 'N/A')}")
+                return [self.emit(self._ip_api_record(data))]
             else:
                 print("❌ IP lookup failed")
                 
         except Exception as e:
             print(f"❌ Error in IP intelligence: {e}")
+        return []
+    
+    @staticmethod
+    def _ip_api_record(data):
+        return IPInfo(data['query'], data.get('as', ''), data.get('countryCode', ''),
+                      data.get('org', ''), 'ip-api', data)
+    
+    @instrumented('ip', label=lambda ips, *args: f"{len(ips)} addresses")
+    def ip_intelligence_batch(self, ips, batch_size=100):
+        """Bulk IP lookups, grouping addresses into batch API requests"""
+        print(f"\n🌐 [IP INTELLIGENCE] Batch lookup for {len(ips)} addresses")
+        
+        results = []
+        for offset in range(0, len(ips), batch_size):
+            batch = ips[offset:offset + batch_size]
+            token = METRICS.start('http')
+            try:
+                response = self.session.post(f"{self.ip_api_url}/batch", json=batch, timeout=15)
+                METRICS.stop(token, nbytes=len(response.content))
+                token = None
+                for data in response.json():
+                    if data.get('status') == 'success':
+                        results.append(self.emit(self._ip_api_record(data)))
+                        print(f"   ✅ {data['query']:39} {data.get('as', 'N/A')} | {data.get('country', 'N/A')} | {data.get('org', 'N/A')}")
+                    else:
+                        print(f"   ❌ {data.get('query', '?'):39} {data.get('message', 'lookup failed')}")
+                
+                # ip-api reports remaining requests and the window reset in seconds
+                if response.headers.get('X-Rl') == '0':
+                    time.sleep(int(response.headers.get('X-Ttl', '60')))
+            except Exception as e:
+                METRICS.stop(token, 'error')
+                print(f"❌ Error in IP intelligence batch: {e}")
+        
+        print(f"\n📍 Batch Summary: {len(results)}/{len(ips)} addresses resolved")
+        return results
     
-    def website_forensics(self, url):
+    @instrumented('ip', label=lambda ips, *args: f"{len(ips)} addresses")
+    def ip_intelligence_offline(self, ips, db_path):
+        """Annotate addresses with ASN/country from a local range file, without any network"""
+        print(f"\n🌐 [IP INTELLIGENCE] Offline lookup for {len(ips)} addresses")
+        
+        try:
+            if self.ip_index is None or self.ip_index_path != db_path:
+                start = time.perf_counter()
+                from ip_index import IPRangeIndex
+                self.ip_index = IPRangeIndex.load(db_path)
+                self.ip_index_path = db_path
+                print(f"   Loaded {len(self.ip_index)} ranges in {time.perf_counter() - start:.1f}s")
+            
+            results = []
+            for ip, info in self.ip_index.lookup_many(ips):
+                if info:
+                    results.append(self.emit(IPInfo(ip, info['asn'], info['country'], info['org'], 'offline', None)))
+                    print(f"   ✅ {ip:39} AS{info['asn']} | {info['country']} | {info['org']}")
+                else:
+                    print(f"   ❌ {ip:39} not in database")
+            
+            print(f"\n📍 Offline Summary: {len(results)}/{len(ips)} addresses matched")
+            return results
+            
+        except Exception as e:
+            print(f"❌ Error in offline IP intelligence: {e}")
+            return []
+    
+    @instrumented('forensics')
+    def website_forensics(self, url, response=None):
         """Website security headers and information"""
         print(f"\n🔒 [WEBSITE FORENSICS] Analyzing: {url}")
         
@@ -123,12 +278,30 @@ class OSINTTool:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            response = self.session.get(url, timeout=15, allow_redirects=True)
+            scope = scan_key('forensics', url)
+            previous = None
+            if self.snapshots is not None:
+                response, previous = self.snapshots.revalidate(scope, url, response)
+            elif response is None:
+                from http_layer import fetch
+                response = fetch(url, timeout=15)
+            
+            if previous is not None:
+                # A 304 or an identical body only vouches for the page itself; headers are read fresh below
+                print("   ♻️ Page unchanged since the last snapshot, reusing its response details")
+                findings = [record for record in previous if record.category == 'response']
+            else:
+                findings = [
+                    HTTPFinding(url, 'response', 'status_code', response.status_code),
+                    HTTPFinding(url, 'response', 'final_url', response.url),
+                    HTTPFinding(url, 'response', 'content_length', len(response.content)),
+                ]
+            details = {finding.name: finding.value for finding in findings}
             
             print(f"\n📊 Response Details:")
-            print(f"   Status Code: {response.status_code}")
-            print(f"   Final URL: {response.url}")
-            print(f"   Content Length: {len(response.content)} bytes")
+            print(f"   Status Code: {details['status_code']}")
+            print(f"   Final URL: {details['final_url']}")
+            print(f"   Content Length: {details['content_length']} bytes")
             print(f"   Encoding: {response.encoding}")
             
             print(f"\n🏗️ Server Headers:")
@@ -136,6 +309,7 @@ class OSINTTool:
             for header in server_headers:
                 value = response.headers.get(header, 'NOT DISCLOSED')
                 print(f"   {header.title()}: {value}")
+                findings.append(HTTPFinding(url, 'server-header', header, response.headers.get(header)))
             
             print(f"\n🛡️ Security Headers Analysis:")
             security_headers = {
@@ -151,11 +325,15 @@ class OSINTTool:
                 value = response.headers.get(header, '❌ NOT SET')
                 status = "✅" if value != '❌ NOT SET' else "❌"
                 print(f"   {status} {description}: {value}")
+                findings.append(HTTPFinding(url, 'security-header', header, response.headers.get(header)))
+            
+            return self.track(scope, [self.emit(finding) for finding in findings], response)
                 
         except Exception as e:
             print(f"❌ Error in website forensics: {e}")
+            return []
     
-    def subdomain_discovery(self, domain, wordlist=None):
+    def subdomain_discovery(self, domain, wordlist=None, concurrency=100):
         """Subdomain enumeration with common wordlist"""
         print(f"\n🔎 [SUBDOMAIN DISCOVERY] Scanning: {domain}")
         
@@ -170,61 +348,332 @@ class OSINTTool:
         else:
             subdomains = wordlist
         
-        discovered = []
-        
-        def check_subdomain(subdomain):
-            full_domain = f"{subdomain}.{domain}"
-            try:
-                ip = socket.gethostbyname(full_domain)
-                discovered.append((full_domain, ip))
-                print(f"   ✅ Found: {full_domain} → {ip}")
-            except socket.gaierror:
-                pass
-            except Exception as e:
-                pass
-        
         print(f"   Scanning {len(subdomains)} subdomains...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            executor.map(check_subdomain, subdomains)
+        discovered = list(self.subdomain_stream(domain, subdomains, concurrency))
         
         print(f"\n📈 Discovery Summary: {len(discovered)} subdomains found")
         return discovered
     
-    def network_port_scan(self, target, ports=None):
-        """Network port scanning for common services"""
+    @instrumented('subdomains')
+    def subdomain_stream(self, domain, wordlist, concurrency=100, scope=None):
+        """Stream Subdomain records from an iterable or lazily read wordlist file
+        
+        Progress through the wordlist is checkpointed, so a resumed run skips every word already checked.
+        The names found so far are checkpointed too: a resumed run yields them first (without sending
+        them to the sink again), so callers chaining on the results see the whole scan.
+        scope identifies a generated wordlist whose checkpoint cannot be keyed by the wordlist itself.
+        """
+        from dns_engine import iter_wordlist
+        
+        words = iter_wordlist(wordlist) if isinstance(wordlist, str) else wordlist
+        if scope is None:
+            scope = wordlist if isinstance(wordlist, (str, list, tuple)) else None
+        key = scan_key('subdomains', domain, scope)
+        saved = self.checkpoint.load(key)
+        progress = Progress(saved.get('offset', 0), saved.get('done', ()))
+        checked = 0
+        found = saved.get('emitted', 0)
+        finds = [Subdomain(name, ips) for name, ips in saved.get('finds', ())]
+        skipped = {'wildcard': 0, 'nxparent': 0}
+        resumed = bool(progress.count)
+        if resumed:
+            print(f"   ↩️ Resuming after {progress.count} checked names ({found} already found)")
+        # Checkpoints written before finds were saved cannot be replayed, so their results stay partial
+        partial = len(finds) < found
+        if finds:
+            print(f"   ↩️ Replaying {len(finds)} names found before the interruption")
+        yield from finds
+        
+        # Words complete out of order; pending maps each in-flight name back to its wordlist index
+        pending = {}
+        
+        def remaining():
+            for index, word in enumerate(words):
+                if not progress.skip(index):
+                    pending.setdefault(f"{word}.{domain}", deque()).append(index)
+                    yield word
+        
+        def state():
+            return dict(progress.state(), emitted=found, finds=[[record.name, record.ips] for record in finds])
+        
+        # Pre-flight: random labels reveal wildcard DNS before the real scan
+        wildcard = self.dns.wildcard_answers(domain)
+        if wildcard:
+            print(f"   ⚠️ Wildcard DNS detected: {', '.join(sorted(wildcard))} (matching answers will be dropped)")
+        
+        # Attempt timeouts are capped at half the query lifetime so every query gets at least one resend
+        controller = self._controller(concurrency, self.dns.timeout / 2, min(0.5, self.dns.attempt_timeout))
+        start = time.perf_counter()
+        completed = False
+        try:
+            for name, ips, status in self.dns.iter_subdomains(domain, remaining(), concurrency, wildcard, controller):
+                indexes = pending[name]
+                progress.complete(indexes.popleft())
+                if not indexes:
+                    del pending[name]
+                checked += 1
+                if status == 'found':
+                    found += 1
+                    print(f"   ✅ Found: {name} → {', '.join(ips)}")
+                    record = self.emit(Subdomain(name, ips))
+                    finds.append(record)
+                    yield record
+                elif status in skipped:
+                    skipped[status] += 1
+                if checked % 10000 == 0:
+                    rate = checked / (time.perf_counter() - start)
+                    print(f"   ⏳ {checked} names checked, {found} found ({rate:.0f} names/sec)")
+                if self.checkpoint.due():
+                    self.checkpoint.update(key, state())
+            completed = True
+            self.checkpoint.finish(key)
+        finally:
+            if not completed:
+                self.checkpoint.update(key, state(), force=True)
+            elapsed = time.perf_counter() - start
+            rate = checked / elapsed if elapsed > 0 else 0
+            print(f"   📊 Checked {checked} names in {elapsed:.1f}s ({rate:.0f} names/sec)")
+            if skipped['wildcard'] or skipped['nxparent']:
+                print(f"   🧹 Dropped {skipped['wildcard']} wildcard matches, skipped {skipped['nxparent']} names under NXDOMAIN parents")
+            if controller is not None:
+                print(f"   📶 Adaptive: {controller.summary()}")
+        
+        self._track_scan(key, finds, partial)
+    
+    @instrumented('permutations')
+    def permutation_discovery(self, domain, known, words=None, concurrency=100, rounds=5, capacity=10_000_000):
+        """Resolve altdns-style permutations of known subdomains, permuting each round's finds again (words: list or file)
+        
+        Candidates are generated lazily and deduplicated with a Bloom filter, so
+        millions of them cost megabytes. Stops when a round finds nothing new.
+        """
+        from dns_engine import iter_wordlist
+        from permutations import PERMUTATION_WORDS, BloomFilter, iter_candidates
+        
+        if words is None:
+            words = PERMUTATION_WORDS
+        words = list(iter_wordlist(words) if isinstance(words, str) else words)
+        seen = BloomFilter(capacity)
+        frontier = sorted({record.name for record in known if record.kind == 'subdomain'})
+        for name in frontier:
+            if name.endswith('.' + domain):
+                seen.add(name[:-len(domain) - 1])
+        print(f"\n🧬 [PERMUTATIONS] {len(frontier)} seed names, {len(words)} words for {domain}")
+        
+        discovered = []
+        for round_number in range(1, rounds + 1):
+            if not frontier:
+                break
+            print(f"   🔁 Round {round_number}: permuting {len(frontier)} names")
+            # The same seeds always generate the same candidates, so a resumed round can skip by offset
+            scope = ['permutations', round_number, frontier, words]
+            found = list(self.subdomain_stream(domain, iter_candidates(frontier, domain, seen, words),
+                                               concurrency, scope=scope))
+            discovered.extend(found)
+            frontier = sorted(record.name for record in found if record.kind == 'subdomain')
+            if seen.saturated:
+                print(f"   ⚠️ {len(seen)} candidates exceed the filter capacity of {capacity}; some may be skipped")
+        
+        print(f"   📊 {len(seen)} candidates tried, {len(discovered)} names found through permutations")
+        return discovered
+    
+    @instrumented('certificates')
+    def certificate_discovery(self, domain, known=(), open_ports=(), concurrency=50, timeout=5.0, rounds=3):
+        """Harvest TLS certificates from known names and open TLS ports, then resolve new in-scope SAN names
+        
+        Names that resolve are probed in turn, until a round turns up nothing new.
+        """
+        from tls_harvest import TLS_PORTS, CertificateHarvester, in_scope
+        
+        names = {domain} | {record.name for record in known if record.kind == 'subdomain'}
+        targets = [(name, 443, name) for name in sorted(names)]
+        for record in open_ports:
+            if record.kind == 'port' and record.port in TLS_PORTS:
+                # A bare IP gets the scanned domain as SNI, so name-based virtual hosts answer with their own certificate
+                sni = domain if classify_target(record.host)[0] == 'ip' else record.host
+                targets.append((record.host, record.port, sni))
+        print(f"\n🔐 [TLS CERTIFICATES] {len(targets)} endpoints for {domain}")
+        
+        harvester = CertificateHarvester(concurrency, timeout)
+        certificates, discovered = [], []
+        for _ in range(rounds):
+            candidates = set()
+            failed = 0
+            for host, port, sni, certificate, error in harvester.iter_harvest(targets):
+                if certificate is None:
+                    failed += 1
+                    continue
+                print(f"   ✅ {host}:{port} → CN={certificate['subject_cn']}, {len(certificate['sans'])} SANs, "
+                      f"expires {certificate['not_after']}")
+                certificates.append(self.emit(Certificate(host, port, sni, certificate['subject_cn'], certificate['issuer'],
+                                                          certificate['not_after'], certificate['sans'])))
+                for san in certificate['sans'] + [certificate['subject_cn']]:
+                    name = in_scope(san, domain)
+                    if name is not None and name not in names:
+                        candidates.add(name)
+            if failed:
+                print(f"   ⚠️ {failed} endpoints gave no certificate")
+            if not candidates:
+                break
+            
+            names |= candidates
+            print(f"   🌱 {len(candidates)} new names from certificates, resolving...")
+            found = list(self.subdomain_stream(domain, sorted(name[:-len(domain) - 1] for name in candidates)))
+            discovered.extend(found)
+            targets = [(record.name, 443, record.name) for record in found if record.kind == 'subdomain']
+            if not targets:
+                break
+        
+        print(f"   📊 {len(certificates)} certificates, {len(discovered)} names found through them")
+        return self.track(scan_key('certificates', domain), certificates) + discovered
+    
+    @instrumented('ptr', label=lambda cidrs, *args, **kwargs: ','.join(cidrs))
+    def ptr_sweep(self, cidrs, concurrency=200, rate=200.0, nameservers=None):
+        """Stream DNSAnswer PTR records for every address in IPv4/IPv6 CIDR ranges
+        
+        Addresses are generated lazily and progress is checkpointed like a wordlist scan.
+        """
+        from ptr_sweep import PTRSweeper, count_addresses, iter_addresses
+        
+        total = count_addresses(cidrs)
+        print(f"\n🔁 [PTR SWEEP] {', '.join(cidrs)} ({total} addresses, {rate:g} queries/sec per resolver)")
+        
+        sweeper = PTRSweeper(nameservers or self.dns.resolver.nameservers, port=self.dns.resolver.port, timeout=self.dns.timeout,
+                             rate=rate, cache=self.dns.cache)
+        key = scan_key('ptr', ','.join(cidrs), list(cidrs))
+        saved = self.checkpoint.load(key)
+        progress = Progress(saved.get('offset', 0), saved.get('done', ()))
+        found = saved.get('emitted', 0)
+        resumed = bool(progress.count)
+        if resumed:
+            print(f"   ↩️ Resuming after {progress.count} swept addresses ({found} already named)")
+        named = []
+        pending = {}
+        
+        def remaining():
+            for index, address in enumerate(iter_addresses(cidrs)):
+                if not progress.skip(index):
+                    pending.setdefault(str(address), deque()).append(index)
+                    yield address
+        
+        checked = failed = 0
+        start = time.perf_counter()
+        completed = False
+        try:
+            for address, names, error in sweeper.iter_sweep(remaining(), concurrency):
+                indexes = pending[address]
+                progress.complete(indexes.popleft())
+                if not indexes:
+                    del pending[address]
+                checked += 1
+                if error not in (None, 'NXDOMAIN', 'NOANSWER'):
+                    failed += 1
+                for name in names:
+                    found += 1
+                    print(f"   ✅ {address} → {name}")
+                    record = self.emit(DNSAnswer(address, 'PTR', name))
+                    if self.snapshots is not None:
+                        named.append(record)
+                    yield record
+                if checked % 10000 == 0:
+                    rate_now = checked / (time.perf_counter() - start)
+                    print(f"   ⏳ {checked}/{total} addresses swept, {found} names ({rate_now:.0f} addresses/sec)")
+                if self.checkpoint.due():
+                    self.checkpoint.update(key, dict(progress.state(), emitted=found))
+            completed = True
+            self.checkpoint.finish(key)
+        finally:
+            if not completed:
+                self.checkpoint.update(key, dict(progress.state(), emitted=found), force=True)
+            elapsed = time.perf_counter() - start
+            print(f"   📊 Swept {checked} addresses in {elapsed:.1f}s "
+                  f"({checked / elapsed if elapsed > 0 else 0:.0f} addresses/sec, {failed} failed)")
+        
+        self._track_scan(key, named, resumed)
+    
+    @instrumented('ports')
+    def network_port_scan(self, target, ports=None, max_inflight=1000, timeout=2.0, identify=False, banner_timeout=1.0):
+        """Network port scanning for common services
+        
+        With identify set, each open port's banner (or reply to one probe) is read on the
+        connection that found it and matched for service, product and version.
+        """
+        from port_scanner import AsyncPortScanner, parse_ports, service_name
+        
         if ports is None:
             ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 8080, 8443, 3306, 3389]
+        elif isinstance(ports, str):
+            ports = parse_ports(ports)
         
         print(f"\n🔌 [PORT SCANNING] Target: {target}")
-        print(f"   Scanning {len(ports)} common ports...")
+        address = self.resolve_host(target)
+        if address is None:
+            print(f"❌ Cannot resolve {target} for port scanning")
+            return []
         
-        def scan_port(port):
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(2)
-                    result = sock.connect_ex((target, port))
-                    if result == 0:
-                        try:
-                            service = socket.getservbyport(port, 'tcp')
-                        except:
-                            service = 'unknown'
-                        return port, service
-            except:
-                pass
-            return None
+        key = scan_key('ports', target, ports)
+        saved = self.checkpoint.load(key)
+        progress = Progress(saved.get('offset', 0), saved.get('done', ()))
+        emitted = saved.get('emitted', 0)
+        index_of = {port: index for index, port in enumerate(ports)}
+        remaining = [port for index, port in enumerate(ports) if not progress.skip(index)]
+        resumed = bool(progress.count)
+        if resumed:
+            print(f"   ↩️ Resuming after {progress.count} scanned ports ({emitted} already open)")
+        print(f"   Scanning {len(remaining)} ports...")
         
+        scanner = AsyncPortScanner(max_inflight=max_inflight, timeout=timeout, adaptive=self.adaptive,
+                                   identify=identify, banner_timeout=banner_timeout)
         open_ports = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-            results = executor.map(scan_port, ports)
-            for result in results:
-                if result:
-                    port, service = result
-                    print(f"   ✅ Port {port}/tcp open - {service}")
-                    open_ports.append((port, service))
+        unprobed = 0
+        start = time.perf_counter()
+        completed = False
+        try:
+            for port, state, identity in scanner.iter_scan(address, remaining):
+                if state == 'unprobed':
+                    # Left out of the checkpoint so --resume tries it again
+                    unprobed += 1
+                    continue
+                progress.complete(index_of[port])
+                if state == 'open':
+                    service, product, version = identity or (service_name(port), None, None)
+                    details = ' '.join(part for part in (product, version) if part)
+                    print(f"   ✅ Port {port}/tcp open - {service}" + (f" ({details})" if details else ""))
+                    open_ports.append(self.emit(OpenPort(target, port, service, product, version)))
+                    emitted += 1
+                if self.checkpoint.due():
+                    self.checkpoint.update(key, dict(progress.state(), emitted=emitted))
+            completed = not unprobed
+            if completed:
+                self.checkpoint.finish(key)
+        finally:
+            if not completed:
+                self.checkpoint.update(key, dict(progress.state(), emitted=emitted), force=True)
         
-        print(f"\n📊 Port Scan Summary: {len(open_ports)} ports open")
-        return open_ports
+        open_ports.sort(key=lambda record: record.port)
+        elapsed = time.perf_counter() - start
+        print(f"\n📊 Port Scan Summary: {emitted} ports open ({len(remaining) - unprobed} scanned in {elapsed:.1f}s)")
+        if unprobed:
+            print(f"   ⚠️ {unprobed} ports not probed: out of sockets or buffers (--resume retries them)")
+        if self.adaptive:
+            print(f"   📶 Adaptive: {scanner.controller.summary()}")
+        return self._track_scan(key, open_ports, resumed or unprobed > 0)
     
+    def _controller(self, maximum, max_timeout, min_timeout):
+        """AIMD controller capped at maximum when adaptive mode is on, else None (fixed concurrency)"""
+        if not self.adaptive:
+            return None
+        from congestion import AIMDController
+        return AIMDController(maximum, max_timeout=max_timeout, min_timeout=min_timeout)
+    
+    def _track_scan(self, key, records, resumed):
+        """Snapshot a checkpointed scan; a resumed or incomplete run only holds part of the results, so it is not compared"""
+        if resumed and self.snapshots is not None:
+            print("   ⚠️ Resumed or incomplete scan: results are not compared with the last snapshot")
+            return records
+        return self.track(key, records)
+    
+    @instrumented('footprint')
     def digital_footprint(self, username):
         """Check digital footprint across platforms"""
         print(f"\n👤 [DIGITAL FOOTPRINT] Username: {username}")
@@ -242,30 +691,137 @@ class OSINTTool:
             'GitLab': f'https://gitlab.com/{username}',
         }
         
-        found = []
+        import requests
+        from congestion import AIMDController
+        from scheduler import adaptive_threads
         
-        for platform, url in platforms.items():
+        # Platforms are checked concurrently; timeouts and rate limiting shrink the window and are retried once
+        controller = AIMDController(len(platforms), initial=4, max_timeout=8, min_timeout=2)
+        
+        def check(platform):
+            url = platforms[platform]
+            token = METRICS.start('http')
+            start = time.perf_counter()
             try:
-                response = self.session.head(url, timeout=8, allow_redirects=False)
-                if response.status_code in [200, 301, 302]:
-                    print(f"   ✅ {platform:12}: Account exists")
-                    found.append(platform)
-                else:
-                    print(f"   ❌ {platform:12}: Not found")
-            except:
-                print(f"   ⚠️ {platform:12}: Connection failed")
+                response = self.session.head(url, timeout=controller.timeout(), allow_redirects=False)
+            except requests.Timeout:
+                METRICS.stop(token, 'timeout')
+                controller.congestion()
+                return platform, None, 'timed out'
+            except requests.RequestException as e:
+                METRICS.stop(token, 'error')
+                return platform, None, type(e).__name__
+            METRICS.stop(token)
+            if response.status_code in (429, 503):
+                controller.congestion()
+            else:
+                controller.observe(time.perf_counter() - start)
+            return platform, response.status_code, None
+        
+        def dropped(result):
+            return result[2] == 'timed out' or result[1] in (429, 503)
+        
+        found = []
+        for platform, status, error in adaptive_threads(check, platforms, controller, dropped):
+            if error is not None:
+                print(f"   ⚠️ {platform:12}: Connection failed ({error})")
+            elif status in (200, 301, 302):
+                print(f"   ✅ {platform:12}: Account exists")
+                found.append(self.emit(Account(username, platform, platforms[platform])))
+            elif status in (429, 503):
+                print(f"   ⚠️ {platform:12}: Rate limited ({status})")
+            else:
+                print(f"   ❌ {platform:12}: Not found")
         
         print(f"\n📱 Digital Presence: {len(found)} platforms found")
         return found
     
+    def batch_scan(self, targets, modules, max_workers=16, per_host=2, port_options=None):
+        """Run the chosen modules over many targets through one shared scheduler, yielding each job's records
+        
+        Records are yielded as jobs finish rather than collected, so a streamed
+        batch holds no more than one job's results in memory.
+        """
+        key = scan_key('batch', f"{len(targets)} targets", targets, modules)
+        finished = {tuple(job) for job in self.checkpoint.load(key).get('done', ())}
+        
+        pending = []
+        for target in targets:
+            kind, host = classify_target(target)
+            for module in modules:
+                if kind in BATCH_MODULES[module] and (module, target) not in finished:
+                    pending.append((host, module, target))
+        
+        port_options = dict(port_options or {})
+        # Concurrent port scans share one process and its open-file limit, so they split one connect budget
+        scans = min(max_workers, sum(1 for _, module, _ in pending if module == 'ports'))
+        if scans > 1:
+            from port_scanner import scanner_budget
+            port_options['max_inflight'] = scanner_budget(port_options.get('max_inflight', 1000), scans)
+        runners = {
+            'recon': self.domain_reconnaissance,
+            'subdomains': self.subdomain_discovery,
+            'ports': functools.partial(self.network_port_scan, **port_options),
+            'ip': self.ip_intelligence,
+            'web': self.website_forensics,
+        }
+        jobs = [(host, (module, target), functools.partial(runners[module], target)) for host, module, target in pending]
+        
+        print(f"\n📦 [BATCH MODE] {len(jobs)} jobs across {len(targets)} targets "
+              f"({max_workers} workers, {per_host} per host)")
+        if scans > 1:
+            print(f"   🔌 Up to {scans} port scans at once, {port_options['max_inflight']} connections each")
+        if finished:
+            print(f"   ↩️ Resuming: {len(finished)} jobs already completed")
+        
+        records = 0
+        from scheduler import BatchScheduler
+        scheduler = BatchScheduler(max_workers, per_host)
+        completed = False
+        try:
+            for done, (host, (module, target), result, error, elapsed) in enumerate(scheduler.run(jobs), 1):
+                status = "✅" if error is None else f"❌ {error}"
+                print(f"   [{done}/{len(jobs)}] {module} {target} ({elapsed:.1f}s) {status}")
+                if error is None:
+                    result = result or []
+                    records += len(result)
+                    yield from result
+                    # Failed jobs are left out of the checkpoint so a resumed run retries them
+                    finished.add((module, target))
+                else:
+                    records += 1
+                    yield self.emit(ScanError(target, module, str(error)))
+                if self.checkpoint.due():
+                    self.checkpoint.update(key, {'done': sorted(finished)})
+            completed = True
+            self.checkpoint.finish(key)
+        finally:
+            if not completed:
+                self.checkpoint.update(key, {'done': sorted(finished)}, force=True)
+        
+        print(f"\n📦 Batch Summary: {len(jobs)} jobs completed, {records} records")
+    
     def export_results(self, data, filename):
         """Export results to JSON file"""
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                json.dump(data, f, indent=2, ensure_ascii=False, default=to_jsonable)
             print(f"\n💾 Results exported to: {filename}")
         except Exception as e:
             print(f"❌ Error exporting results: {e}")
+    
+    def export_metrics(self, filename):
+        """Write the --profile summary to a JSON file, or print it for '-'"""
+        summary = json.dumps(METRICS.summary(), indent=2)
+        if filename == '-':
+            print(f"\n⏱️ Metrics Summary:\n{summary}")
+            return
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(summary + '\n')
+            print(f"\n⏱️ Metrics written to: {filename}")
+        except Exception as e:
+            print(f"❌ Error exporting metrics: {e}")
 
 def ethical_warning():
     """Display ethical usage warning"""
@@ -289,13 +845,6 @@ The developers are not responsible for any misuse.
     """)
 
 def main():
-    tool = OSINTTool()
-    tool.display_banner()
-    ethical_warning()
-    
-    if not tool.check_dependencies():
-        sys.exit(1)
-    
     parser = argparse.ArgumentParser(
         description='Educational OSINT Tool for Cybersecurity Learning',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -305,16 +854,67 @@ Examples:
   python osint_tool.py -i 8.8.8.8 -o ip_report.json
   python osint_tool.py -s target.com -p 192.168.1.1
   python osint_tool.py -U john_doe --full-scan
+  python osint_tool.py -u example.com --full-scan
         '''
     )
     
     parser.add_argument('-d', '--domain', help='Target domain for reconnaissance')
     parser.add_argument('-i', '--ip', help='Target IP address for intelligence')
+    parser.add_argument('--ip-list', help='File with one IP address per line for batch IP intelligence')
+    parser.add_argument('--ip-db', help='Offline CSV/TSV range file (start,end,asn,country,org) for IP lookups')
+    parser.add_argument('--ip-api', default='http://ip-api.com', help='Base URL of the ip-api compatible lookup service')
     parser.add_argument('-u', '--url', help='Target URL for website forensics')
+    parser.add_argument('--audit-list', help='File with one URL per line for a bulk security-header audit')
+    parser.add_argument('--http-concurrency', type=int, default=100, help='HTTP requests kept in flight during bulk audits')
+    parser.add_argument('--crawl', action='append', metavar='URL', help='Crawl from this URL (repeatable) for a site-wide inventory')
+    parser.add_argument('--crawl-hosts', help="Comma-separated hosts the crawl may visit (default: the seed URLs' hosts)")
+    parser.add_argument('--crawl-depth', type=int, default=2, help='Maximum link depth from the seed URLs')
+    parser.add_argument('--crawl-pages', type=int, default=100, help='Maximum pages fetched per crawl')
+    parser.add_argument('--crawl-workers', type=int, default=8, help='Concurrent page fetches during a crawl')
+    parser.add_argument('--crawl-delay', type=float, default=0.25, help='Minimum seconds between requests to one host')
     parser.add_argument('-s', '--subdomain', help='Domain for subdomain discovery')
+    parser.add_argument('-w', '--wordlist', help='Wordlist file streamed into subdomain discovery')
+    parser.add_argument('--concurrency', type=int, default=100, help='DNS queries kept in flight during subdomain discovery')
+    parser.add_argument('--jsonl', help='Append every record to this JSONL file as it is produced')
+    parser.add_argument('--ptr', action='append', metavar='CIDR',
+                        help='Reverse-DNS sweep of an IPv4/IPv6 range, e.g. 192.0.2.0/24 (repeatable, comma-separated)')
+    parser.add_argument('--ptr-rate', type=float, default=200.0, help='PTR queries per second per resolver')
+    parser.add_argument('--resolvers', help='Comma-separated resolvers for PTR sweeps (default: system resolvers)')
+    parser.add_argument('--permute', action='store_true',
+                        help='Resolve permutations of found subdomains (dev-api, api2, staging.api...) until none are new')
+    parser.add_argument('--permute-words', help='Words file for --permute (default: a built-in list)')
+    parser.add_argument('--permute-rounds', type=int, default=5, help='Maximum permutation rounds')
+    parser.add_argument('--tls', action='store_true',
+                        help='Harvest TLS certificates from found subdomains and open 443/8443 ports and resolve their SAN names')
     parser.add_argument('-p', '--portscan', help='Target for port scanning')
+    parser.add_argument('--ports', help="Ports to scan, e.g. '22,80,8000-8100', 'top-1000' or '1-65535'")
+    parser.add_argument('--max-inflight', type=int, default=1000, help='Maximum concurrent connection attempts during port scans')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Let DNS, port scan and HTTP audit concurrency find its own level (AIMD); '
+                             '--concurrency, --max-inflight and --http-concurrency become ceilings')
+    parser.add_argument('--port-timeout', type=float, default=2.0, help='Upper bound on the adaptive connect timeout in seconds')
+    parser.add_argument('--identify', action='store_true',
+                        help='Identify service, product and version of open ports over the scanning connection')
+    parser.add_argument('--banner-timeout', type=float, default=1.0, help='Seconds to wait for a banner or probe reply with --identify')
     parser.add_argument('-U', '--username', help='Username for digital footprint analysis')
-    parser.add_argument('-o', '--output', help='Output file to save results')
+    parser.add_argument('--domain-list', help='File with one domain per line for bulk DNS reconnaissance')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the persistent DNS cache')
+    parser.add_argument('--targets', help='File with one domain, IP or URL per line for batch mode')
+    parser.add_argument('--modules', default='recon,ports',
+                        help=f"Comma-separated batch modules ({', '.join(BATCH_MODULES)})")
+    parser.add_argument('--workers', type=int, default=16, help='Global number of concurrent batch jobs')
+    parser.add_argument('--per-host', type=int, default=2, help='Maximum concurrent batch jobs per host')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue interrupted scans from the last checkpoint (use with --jsonl to keep earlier records)')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: checkpoint.json in the cache directory)')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='Record results in the snapshot store and revalidate unchanged pages instead of re-parsing them')
+    parser.add_argument('--diff', action='store_true', help='Like --snapshot, but report only what changed since the last snapshot')
+    parser.add_argument('--snapshot-db', help='Snapshot database (default: snapshots.sqlite3 in the cache directory)')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help='Record per-stage timings and write a JSON metrics summary (to stdout by default)')
+    parser.add_argument('--metrics-port', type=int, help='Serve live Prometheus metrics on this localhost port')
+    parser.add_argument('-o', '--output', help='Output file to save results (.jsonl/.ndjson files are streamed)')
     parser.add_argument('--full-scan', action='store_true', help='Perform comprehensive scan when using domain')
     
     args = parser.parse_args()
@@ -323,44 +923,162 @@ Examples:
         parser.print_help()
         return
     
+    # --help and argument errors exit above without the banner or any imports
+    tool = OSINTTool()
+    tool.display_banner()
+    ethical_warning()
+    
+    if not tool.check_dependencies():
+        sys.exit(1)
+    
+    tool.use_dns_cache = not args.no_cache
+    tool.adaptive = args.adaptive
+    tool.ip_api_url = args.ip_api.rstrip('/')
+    
+    # Streamed records are written as they arrive; only a plain JSON export needs them kept in memory
+    stream_path = args.jsonl
+    if args.output and args.output.endswith(('.jsonl', '.ndjson')):
+        stream_path = stream_path or args.output
+    export_path = args.output if args.output and args.output != stream_path else None
+    if stream_path:
+        tool.sink = JSONLWriter(stream_path)
+    tool.checkpoint = Checkpoint(args.checkpoint or default_checkpoint_path(), resume=args.resume)
+    if args.snapshot or args.diff or args.snapshot_db:
+        from snapshot import SnapshotStore
+        tool.snapshots = SnapshotStore(args.snapshot_db, diff_only=args.diff)
+    if args.profile or args.metrics_port:
+        METRICS.enable()
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+        print(f"📈 Prometheus metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+    
     results = {}
     
+    def keep(section, records):
+        """Consume records, holding them under section only for a plain JSON export"""
+        # A --diff export holds the changes the snapshot store collects, not the full results
+        held = results.setdefault(section, []) if export_path and not args.diff else None
+        for record in records:
+            if held is not None:
+                held.append(record)
+    
     try:
         if args.domain:
-            results['domain_recon'] = args.domain
-            tool.domain_reconnaissance(args.domain)
+            recon = tool.domain_reconnaissance(args.domain)
+            keep('domain_recon', recon)
             
             if args.full_scan:
-                results['subdomains'] = tool.subdomain_discovery(args.domain)
-                try:
-                    ip = socket.gethostbyname(args.domain)
-                    results['port_scan'] = tool.network_port_scan(ip)
-                except:
+                subdomains = tool.subdomain_discovery(args.domain)
+                keep('subdomains', subdomains)
+                ips = [record.value for record in recon if record.kind == 'dns' and record.rtype == 'A']
+                open_ports = []
+                if ips:
+                    open_ports = tool.network_port_scan(ips[0], args.ports, args.max_inflight, args.port_timeout,
+                                                        args.identify, args.banner_timeout)
+                    keep('port_scan', open_ports)
+                else:
                     print("❌ Cannot resolve domain for port scanning")
+                if args.tls:
+                    certificates = tool.certificate_discovery(args.domain, subdomains, open_ports)
+                    keep('certificates', certificates)
+                    subdomains = subdomains + certificates
+                if args.permute:
+                    keep('permutations', tool.permutation_discovery(args.domain, subdomains, args.permute_words,
+                                                                    args.concurrency, args.permute_rounds))
+            
+        if args.domain_list:
+            with open(args.domain_list, encoding='utf-8') as f:
+                domains = [line.strip() for line in f if line.strip()]
+            keep('domain_list', tool.domain_reconnaissance_bulk(domains))
             
         if args.ip:
-            results['ip_intelligence'] = args.ip
-            tool.ip_intelligence(args.ip)
-            results['port_scan'] = tool.network_port_scan(args.ip)
+            if args.ip_db:
+                keep('ip_intelligence', tool.ip_intelligence_offline([args.ip], args.ip_db))
+            else:
+                keep('ip_intelligence', tool.ip_intelligence(args.ip))
+            keep('port_scan', tool.network_port_scan(args.ip, args.ports, args.max_inflight, args.port_timeout,
+                                                     args.identify, args.banner_timeout))
+            
+        if args.ip_list:
+            with open(args.ip_list, encoding='utf-8') as f:
+                ips = [line.strip() for line in f if line.strip()]
+            if args.ip_db:
+                keep('ip_list', tool.ip_intelligence_offline(ips, args.ip_db))
+            else:
+                keep('ip_list', tool.ip_intelligence_batch(ips))
             
         if args.url:
-            results['website_forensics'] = args.url
-            tool.website_forensics(args.url)
+            keep('website_forensics', tool.website_forensics(args.url))
+            
+            if args.full_scan:
+                # The page fetched above is served from the shared cache to every analyzer
+                from advance_osint import AdvancedOSINT
+                url = args.url if args.url.startswith(('http://', 'https://')) else 'https://' + args.url
+                advanced = AdvancedOSINT()
+                advanced.sink = tool.sink
+                advanced.snapshots = tool.snapshots
+                keep('metadata', advanced.metadata_analysis(url))
+                keep('technologies', advanced.website_technology(url))
+                keep('security_headers', advanced.security_headers_audit(url))
+            
+        if args.audit_list:
+            from advance_osint import AdvancedOSINT
+            advanced = AdvancedOSINT()
+            advanced.sink = tool.sink
+            advanced.snapshots = tool.snapshots
+            with open(args.audit_list, encoding='utf-8') as f:
+                keep('security_audit', advanced.bulk_security_audit(f, args.http_concurrency, adaptive=args.adaptive))
+            
+        if args.crawl:
+            from advance_osint import AdvancedOSINT
+            advanced = AdvancedOSINT()
+            advanced.sink = tool.sink
+            hosts = {h.strip() for h in args.crawl_hosts.split(',') if h.strip()} if args.crawl_hosts else None
+            keep('crawl', advanced.crawl_inventory(args.crawl, hosts, args.crawl_depth, args.crawl_pages,
+                                                   args.crawl_workers, args.crawl_delay))
             
         if args.subdomain:
-            results['subdomain_discovery'] = args.subdomain
-            tool.subdomain_discovery(args.subdomain)
+            if args.wordlist:
+                print(f"\n🔎 [SUBDOMAIN DISCOVERY] Streaming {args.wordlist} against: {args.subdomain}")
+                subdomains = []
+                for record in tool.subdomain_stream(args.subdomain, args.wordlist, args.concurrency):
+                    subdomains.append(record)
+                    keep('subdomain_discovery', (record,))
+                print(f"\n📈 Discovery Summary: {len(subdomains)} subdomains found")
+            else:
+                subdomains = tool.subdomain_discovery(args.subdomain, concurrency=args.concurrency)
+                keep('subdomain_discovery', subdomains)
+            if args.tls:
+                certificates = tool.certificate_discovery(args.subdomain, subdomains)
+                keep('certificates', certificates)
+                subdomains = subdomains + certificates
+            if args.permute:
+                keep('permutations', tool.permutation_discovery(args.subdomain, subdomains, args.permute_words,
+                                                                args.concurrency, args.permute_rounds))
+            
+        if args.ptr:
+            cidrs = [cidr.strip() for value in args.ptr for cidr in value.split(',') if cidr.strip()]
+            resolvers = [r.strip() for r in args.resolvers.split(',') if r.strip()] if args.resolvers else None
+            keep('ptr_sweep', tool.ptr_sweep(cidrs, args.concurrency, args.ptr_rate, resolvers))
             
         if args.portscan:
-            results['port_scanning'] = args.portscan
-            tool.network_port_scan(args.portscan)
+            keep('port_scanning', tool.network_port_scan(args.portscan, args.ports, args.max_inflight,
+                                                         args.port_timeout, args.identify, args.banner_timeout))
             
-        if args.username:
-            results['digital_footprint'] = args.username
-            tool.digital_footprint(args.username)
+        if args.targets:
+            modules = [m.strip() for m in args.modules.split(',') if m.strip()]
+            unknown = [m for m in modules if m not in BATCH_MODULES]
+            if unknown:
+                print(f"❌ Unknown batch modules: {', '.join(unknown)}")
+                sys.exit(1)
+            with open(args.targets, encoding='utf-8') as f:
+                targets = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            port_options = {'ports': args.ports, 'max_inflight': args.max_inflight, 'timeout': args.port_timeout,
+                            'identify': args.identify, 'banner_timeout': args.banner_timeout}
+            keep('batch', tool.batch_scan(targets, modules, args.workers, args.per_host, port_options))
             
-        if args.output and results:
-            tool.export_results(results, args.output)
+        if args.username:
+            keep('digital_footprint', tool.digital_footprint(args.username))
             
         print(f"\n🎯 OSINT Operations Completed!")
             
@@ -368,6 +1086,19 @@ Examples:
         print("\n\n⚠️  Scan interrupted by user")
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
+    finally:
+        # Whatever was gathered before an interruption is still saved
+        if tool.snapshots is not None:
+            tool.snapshots.close()
+        if tool.sink is not None:
+            tool.sink.close()
+            print(f"\n💾 {tool.sink.count} records streamed to: {stream_path}")
+        if args.diff and tool.snapshots is not None:
+            results = {'changes': tool.snapshots.changes}
+        if export_path and results:
+            tool.export_results(results, export_path)
+        if args.profile:
+            tool.export_metrics(args.profile)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+altdns-style permutations of discovered subdomains, deduplicated with a Bloom filter
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import hashlib
+import math
+import re
+
+PERMUTATION_WORDS = [
+    'dev', 'develop', 'staging', 'stage', 'test', 'qa', 'uat', 'prod', 'preprod', 'demo',
+    'beta', 'alpha', 'internal', 'int', 'corp', 'admin', 'api', 'app', 'web', 'www',
+    'mail', 'vpn', 'old', 'new', 'backup', 'bak', 'v1', 'v2', 'sandbox', 'mgmt',
+]
+
+TRAILING_NUMBER = re.compile(r'^(.*?)(\d+)$')
+
+class BloomFilter:
+    """Fixed-size set membership over a bytearray bitset
+
+    Each item sets k bits taken from one blake2b digest split into two 64-bit
+    halves (double hashing: h1 + i*h2). Ten million items at a 0.1% false
+    positive rate take about 18 MB, against roughly a gigabyte for a set of
+    the same strings. A false positive only means a candidate is not tried.
+    """
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+    
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+    
+    def add(self, item):
+        """Set item's bits; True when at least one was unset, i.e. item is certainly new"""
+        new = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def saturated(self):
+        """More items than the filter was sized for; the false positive rate is now above error_rate"""
+        return self.count > self.capacity
+
+def _numbered(label):
+    """api -> api0..api9 and api-1; api2 -> api1, api3"""
+    match = TRAILING_NUMBER.match(label)
+    if match:
+        stem, digits = match.groups()
+        number = int(digits)
+        for other in (number - 1, number + 1):
+            if other >= 0:
+                yield f'{stem}{other:0{len(digits)}d}'
+        return
+    for number in range(10):
+        yield f'{label}{number}'
+    yield f'{label}-1'
+
+def permute(label, words=PERMUTATION_WORDS):
+    """Yield permutations of one subdomain label (the part left of the target domain)
+
+    For 'api.eu' and the word 'dev': dev.api.eu, dev-api.eu, api-dev.eu,
+    devapi.eu, apidev.eu and dev.eu, plus numbered variants such as api1.eu.
+    """
+    first, _, rest = label.partition('.')
+    suffix = f'.{rest}' if rest else ''
+    for number in _numbered(first):
+        yield number + suffix
+    for word in words:
+        if word == first:
+            continue
+        yield f'{word}.{label}'
+        yield f'{word}-{first}{suffix}'
+        yield f'{first}-{word}{suffix}'
+        yield f'{word}{first}{suffix}'
+        yield f'{first}{word}{suffix}'
+        if rest:
+            yield f'{word}.{rest}'
+
+def iter_candidates(names, domain, seen, words=PERMUTATION_WORDS):
+    """Lazily yield permuted labels of names under domain that seen has not had yet
+
+    Every yielded label is added to seen, so one filter deduplicates across
+    seeds, words and rounds without holding any candidate in memory.
+    """
+    suffix = '.' + domain
+    for name in names:
+        if not name.endswith(suffix):
+            continue
+        for candidate in permute(name[:-len(suffix)], words):
+            if seen.add(candidate):
+                yield candidate
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Non-blocking TCP connect scanner for the OSINT tool
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import time
+from async_utils import adaptive_map, bounded_map, iterate_async
+from congestion import AIMDController
+from metrics import METRICS
+
+# Most frequently open TCP ports, most common first
+TOP_PORTS_BY_FREQUENCY = [
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139, 143, 53, 135, 3306, 8080,
+    1723, 111, 995, 993, 5900, 1025, 587, 8888, 199, 1720, 465, 548, 113, 81,
+    6001, 10000, 514, 5060, 179, 1026, 2000, 8443, 8000, 32768, 554, 26, 1433,
+    49152, 2001, 515, 8008, 49154, 1027, 5666, 646, 5000, 5631, 631, 49153,
+    8081, 2049, 88, 79, 5800, 106, 2121, 1110, 49155, 6000, 513, 990, 5357,
+    427, 49156, 543, 544, 5101, 144, 7, 389
+]
+
+# The wider top-1000 set, as ranges (ranked after the list above, ascending)
+TOP_1000_RANGES = (
+    "1,3-4,6-7,9,13,17,19-26,30,32-33,37,42-43,49,53,70,79-85,88-90,99-100,106,"
+    "109-111,113,119,125,135,139,143-144,146,161,163,179,199,211-212,222,254-256,"
+    "259,264,280,301,306,311,340,366,389,406-407,416-417,425,427,443-445,458,"
+    "464-465,481,497,500,512-515,524,541,543-545,548,554-555,563,587,593,616-617,"
+    "625,631,636,646,648,666-668,683,687,691,700,705,711,714,720,722,726,749,765,"
+    "777,783,787,800-801,808,843,873,880,888,898,900-903,911-912,981,987,990,"
+    "992-993,995,999-1002,1007,1009-1011,1021-1100,1102,1104-1108,1110-1114,1117,"
+    "1119,1121-1124,1126,1130-1132,1137-1138,1141,1145,1147-1149,1151-1152,1154,"
+    "1163-1166,1169,1174-1175,1183,1185-1187,1192,1198-1199,1201,1213,1216-1218,"
+    "1233-1234,1236,1244,1247-1248,1259,1271-1272,1277,1287,1296,1300-1301,"
+    "1309-1311,1322,1328,1334,1352,1417,1433-1434,1443,1455,1461,1494,1500-1501,"
+    "1503,1521,1524,1533,1556,1580,1583,1594,1600,1641,1658,1666,1687-1688,1700,"
+    "1717-1721,1723,1755,1761,1782-1783,1801,1805,1812,1839-1840,1862-1864,1875,"
+    "1900,1914,1935,1947,1971-1972,1974,1984,1998-2010,2013,2020-2022,2030,"
+    "2033-2035,2038,2040-2043,2045-2049,2065,2068,2099-2100,2103,2105-2107,2111,"
+    "2119,2121,2126,2135,2144,2160-2161,2170,2179,2190-2191,2196,2200,2222,2251,"
+    "2260,2288,2301,2323,2366,2381-2383,2393-2394,2399,2401,2492,2500,2522,2525,"
+    "2557,2601-2602,2604-2605,2607-2608,2638,2701-2702,2710,2717-2718,2725,2800,"
+    "2809,2811,2869,2875,2909-2910,2920,2967-2968,2998,3000-3001,3003,3005-3007,"
+    "3011,3013,3017,3030-3031,3052,3071,3077,3128,3168,3211,3221,3260-3261,"
+    "3268-3269,3283,3300-3301,3306,3322-3325,3333,3351,3367,3369-3372,3389-3390,"
+    "3404,3476,3493,3517,3527,3546,3551,3580,3659,3689-3690,3703,3737,3766,3784,"
+    "3800-3801,3809,3814,3826-3828,3851,3869,3871,3878,3880,3889,3905,3914,3918,"
+    "3920,3945,3971,3986,3995,3998,4000-4006,4045,4111,4125-4126,4129,4224,4242,"
+    "4279,4321,4343,4443-4446,4449,4550,4567,4662,4848,4899-4900,4998,5000-5004,"
+    "5009,5030,5033,5050-5051,5054,5060-5061,5080,5087,5100-5102,5120,5190,5200,"
+    "5214,5221-5222,5225-5226,5269,5280,5298,5357,5405,5414,5431-5432,5440,5500,"
+    "5510,5544,5550,5555,5560,5566,5631,5633,5666,5678-5679,5718,5730,5800-5802,"
+    "5810-5811,5815,5822,5825,5850,5859,5862,5877,5900-5904,5906-5907,5910-5911,"
+    "5915,5922,5925,5950,5952,5959-5963,5987-5989,5998-6007,6009,6025,6059,"
+    "6100-6101,6106,6112,6123,6129,6156,6346,6389,6502,6510,6543,6547,6565-6567,"
+    "6580,6646,6666-6669,6689,6692,6699,6779,6788-6789,6792,6839,6881,6901,6969,"
+    "7000-7002,7004,7007,7019,7025,7070,7100,7103,7106,7200-7201,7402,7435,7443,"
+    "7496,7512,7625,7627,7676,7741,7777-7778,7800,7911,7920-7921,7937-7938,"
+    "7999-8002,8007-8011,8021-8022,8031,8042,8045,8080-8090,8093,8099-8100,"
+    "8180-8181,8192-8194,8200,8222,8254,8290-8292,8300,8333,8383,8400,8402,8443,"
+    "8500,8600,8649,8651-8652,8654,8701,8800,8873,8888,8899,8994,9000-9003,"
+    "9009-9011,9040,9050,9071,9080-9081,9090-9091,9099-9103,9110-9111,9200,9207,"
+    "9220,9290,9415,9418,9485,9500,9502-9503,9535,9575,9593-9595,9618,9666,"
+    "9876-9878,9898,9900,9917,9929,9943-9944,9968,9998-10004,10009-10010,10012,"
+    "10024-10025,10082,10180,10215,10243,10566,10616-10617,10621,10626,"
+    "10628-10629,10778,11110-11111,11967,12000,12174,12265,12345,13456,13722,"
+    "13782-13783,14000,14238,14441-14442,15000,15002-15004,15660,15742,"
+    "16000-16001,16012,16016,16018,16080,16113,16992-16993,17877,17988,18040,"
+    "18101,18988,19101,19283,19315,19350,19780,19801,19842,20000,20005,20031,"
+    "20221-20222,20828,21571,22939,23502,24444,24800,25734-25735,26214,27000,"
+    "27352-27353,27355-27356,27715,28201,30000,30718,30951,31038,31337,"
+    "32768-32785,33354,33899,34571-34573,35500,38292,40193,40911,41511,42510,"
+    "44176,44442-44443,44501,45100,48080,49152-49161,49163,49165,49167,"
+    "49175-49176,49400,49999-50003,50006,50300,50389,50500,50636,50800,51103,"
+    "51493,52673,52822,52848,52869,54045,54328,55055-55056,55555,55600,"
+    "56737-56738,57294,57797,58080,60020,60443,61532,61900,62078,63331,64623,"
+    "64680,65000,65129,65389"
+)
+
+COMMON_SERVICES = {
+    21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp', 53: 'domain', 80: 'http',
+    110: 'pop3', 111: 'sunrpc', 135: 'msrpc', 139: 'netbios-ssn', 143: 'imap',
+    443: 'https', 445: 'microsoft-ds', 993: 'imaps', 995: 'pop3s',
+    1433: 'ms-sql-s', 1723: 'pptp', 3306: 'mysql', 3389: 'ms-wbt-server',
+    5432: 'postgresql', 5900: 'vnc', 6379: 'redis', 8080: 'http-proxy',
+    8443: 'https-alt', 27017: 'mongodb'
+}
+
+_service_table = None
+
+# (service, pattern, product, version) tried in order against the first bytes a port sends back;
+# $1, $2 in product and version are replaced by the pattern's groups, as in nmap-service-probes
+SERVICE_SIGNATURES = [
+    ('ssh', rb'^SSH-[\d.]+-OpenSSH_([\w.]+)', 'OpenSSH', '$1'),
+    ('ssh', rb'^SSH-[\d.]+-dropbear_([\w.]+)', 'Dropbear sshd', '$1'),
+    ('ssh', rb'^SSH-[\d.]+-([^\s_]+)(?:_([\w.]+))?', '$1', '$2'),
+    ('smtp', rb'^220[ -][^\r\n]*ESMTP Postfix', 'Postfix smtpd', None),
+    ('smtp', rb'^220[ -][^\r\n]*ESMTP Exim ([\w.]+)', 'Exim smtpd', '$1'),
+    ('smtp', rb'^220[ -][^\r\n]*Microsoft ESMTP MAIL Service', 'Microsoft ESMTP', None),
+    ('smtp', rb'^220[ -][^\r\n]*SMTP', None, None),
+    ('ftp', rb'^220[ -][^\r\n]*\(vsFTPd ([\w.]+)\)', 'vsftpd', '$1'),
+    ('ftp', rb'^220[ -][^\r\n]*ProFTPD ([\w.]+)', 'ProFTPD', '$1'),
+    ('ftp', rb'^220[ -][^\r\n]*Pure-FTPd', 'Pure-FTPd', None),
+    ('ftp', rb'^220[ -][^\r\n]*FileZilla Server(?: version)? ([\w.]+)', 'FileZilla ftpd', '$1'),
+    ('ftp', rb'^220[ -][^\r\n]*FTP', None, None),
+    ('pop3', rb'^\+OK[^\r\n]*Dovecot', 'Dovecot pop3d', None),
+    ('pop3', rb'^\+OK', None, None),
+    ('imap', rb'^\* OK[^\r\n]*Dovecot', 'Dovecot imapd', None),
+    ('imap', rb'^\* OK', None, None),
+    ('mysql', rb'^.{3}\x00\x0a(?:5\.5\.5-)?([\d.]+)-MariaDB', 'MariaDB', '$1'),
+    ('mysql', rb'^.{3}\x00\x0a(\d[\w.-]*)\x00', 'MySQL', '$1'),
+    ('vnc', rb'^RFB (\d{3}\.\d{3})\n', 'VNC', 'protocol $1'),
+    ('telnet', rb'^\xff[\xfb-\xfe]', None, None),
+    ('redis', rb'^(?:\+PONG|-NOAUTH|-DENIED)', 'Redis', None),
+    ('memcached', rb'^VERSION ([\w.]+)', 'Memcached', '$1'),
+    ('postgresql', rb'^[NS]$', 'PostgreSQL', None),
+    ('http', rb'^HTTP/1\.[01] \d{3}.*?\r\nServer: nginx(?:/([\w.]+))?', 'nginx', '$1'),
+    ('http', rb'^HTTP/1\.[01] \d{3}.*?\r\nServer: Apache(?:/([\w.]+))?', 'Apache httpd', '$1'),
+    ('http', rb'^HTTP/1\.[01] \d{3}.*?\r\nServer: Microsoft-IIS/([\w.]+)', 'Microsoft IIS httpd', '$1'),
+    ('http', rb'^HTTP/1\.[01] \d{3}.*?\r\nServer: SimpleHTTP/[\w.]+ Python/([\w.]+)', 'Python http.server', '$1'),
+    ('http', rb'^HTTP/1\.[01] \d{3}.*?\r\nServer: ([^/\r\n]+)(?:/([^\s\r\n]+))?', '$1', '$2'),
+    ('http', rb'^HTTP/1\.[01] \d{3}', None, None),
+    # A TLS alert or handshake in reply to the plain-text probe
+    ('ssl', rb'^\x15\x03[\x00-\x04]', None, None),
+    ('ssl', rb'^\x16\x03[\x00-\x04]', None, None),
+]
+
+# Requests for ports where the client speaks first; everything else gets GENERIC_PROBE if it stays silent
+SERVICE_PROBES = {
+    6379: b'PING\r\n',
+    11211: b'version\r\n',
+    5432: b'\x00\x00\x00\x08\x04\xd2\x16\x2f',  # SSLRequest
+}
+GENERIC_PROBE = b'GET / HTTP/1.0\r\n\r\n'
+# Ports that normally speak TLS from the first byte; they get a ClientHello instead of GENERIC_PROBE
+TLS_PROBE_PORTS = {443, 465, 636, 993, 995, 8443}
+CLIENT_FIRST_PORTS = {80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8888, 9000, 9090} | TLS_PROBE_PORTS | set(SERVICE_PROBES)
+BANNER_BYTES = 4096
+
+_compiled_signatures = None
+_client_hello = None
+
+def _expand_ranges(spec):
+    for part in spec.split(','):
+        if '-' in part:
+            low, high = part.split('-', 1)
+            yield from range(int(low), int(high) + 1)
+        else:
+            yield int(part)
+
+def top_ports(count):
+    """The count most common TCP ports"""
+    ranked = list(TOP_PORTS_BY_FREQUENCY)
+    seen = set(ranked)
+    ranked.extend(port for port in _expand_ranges(TOP_1000_RANGES) if port not in seen)
+    return ranked[:count]
+
+def parse_ports(spec):
+    """Parse a port spec such as '22,80,8000-8100', 'top-1000' or '1-65535'"""
+    ports = []
+    seen = set()
+    for token in str(spec).replace(' ', '').split(','):
+        if not token:
+            continue
+        if token.startswith('top-'):
+            candidates = top_ports(int(token[4:]))
+        elif '-' in token:
+            low, high = (int(value) for value in token.split('-', 1))
+            candidates = range(low, high + 1)
+        else:
+            candidates = [int(token)]
+        for port in candidates:
+            if not 0 < port < 65536:
+                raise ValueError(f"Port out of range: {port}")
+            if port not in seen:
+                seen.add(port)
+                ports.append(port)
+    return ports
+
+def service_name(port):
+    """Service name for a TCP port from a table built once from the system services file"""
+    global _service_table
+    if _service_table is None:
+        table = dict(COMMON_SERVICES)
+        prefix = os.environ.get('PREFIX', '')
+        for path in (os.path.join(prefix, 'etc', 'services'), '/etc/services'):
+            try:
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    for line in f:
+                        fields = line.split('#', 1)[0].split()
+                        if len(fields) >= 2 and fields[1].endswith('/tcp'):
+                            table.setdefault(int(fields[1].split('/')[0]), fields[0])
+                break
+            except (OSError, ValueError):
+                continue
+        _service_table = table
+    return _service_table.get(port, 'unknown')
+
+def match_service(data):
+    """(service, product, version) for the first signature matching data, or None"""
+    global _compiled_signatures
+    if _compiled_signatures is None:
+        import re
+        _compiled_signatures = [(service, re.compile(pattern, re.S), product, version)
+                                for service, pattern, product, version in SERVICE_SIGNATURES]
+    for service, regex, product, version in _compiled_signatures:
+        match = regex.match(data)
+        if match:
+            def fill(template):
+                if template is None:
+                    return None
+                for index, group in enumerate(match.groups(), 1):
+                    template = template.replace(f'${index}', (group or b'').decode('latin-1'))
+                return template.strip() or None
+            return service, fill(product), fill(version)
+    return None
+
+def _tls_client_hello():
+    """ClientHello bytes produced offline through a memory BIO, built once"""
+    global _client_hello
+    if _client_hello is None:
+        import ssl
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        outgoing = ssl.MemoryBIO()
+        tls = context.wrap_bio(ssl.MemoryBIO(), outgoing)
+        try:
+            tls.do_handshake()
+        except ssl.SSLWantReadError:
+            pass
+        _client_hello = outgoing.read()
+    return _client_hello
+
+async def _read_reply(loop, sock, deadline):
+    """Collect what the peer sends until a signature matches, it hangs up, BANNER_BYTES arrive or deadline passes"""
+    data = b''
+    while len(data) < BANNER_BYTES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            chunk = await asyncio.wait_for(loop.sock_recv(sock, BANNER_BYTES - len(data)), remaining)
+        except (asyncio.TimeoutError, OSError):
+            break
+        if not chunk:
+            break
+        data += chunk
+        # HTTP replies wait for the end of the headers, where Server lives
+        if match_service(data) and (not data.startswith(b'HTTP/') or b'\r\n\r\n' in data):
+            break
+    return data
+
+async def identify_service(loop, sock, port, timeout=1.0):
+    """(service, product, version) for an open port, read over its already connected socket, or None
+
+    Server-first protocols (SSH, SMTP, FTP...) announce themselves within
+    timeout; otherwise one request suited to the port is sent and its reply matched.
+    """
+    token = METRICS.start('banner')
+    data = b''
+    outcome = 'cancelled'
+    try:
+        try:
+            if port not in CLIENT_FIRST_PORTS:
+                data = await _read_reply(loop, sock, loop.time() + timeout)
+            if not data:
+                request = _tls_client_hello() if port in TLS_PROBE_PORTS else SERVICE_PROBES.get(port, GENERIC_PROBE)
+                await asyncio.wait_for(loop.sock_sendall(sock, request), timeout)
+                data = await _read_reply(loop, sock, loop.time() + timeout)
+        except (asyncio.TimeoutError, OSError):
+            pass
+        identity = match_service(data) if data else None
+        outcome = 'ok' if identity else 'unmatched'
+    finally:
+        METRICS.stop(token, outcome, nbytes=len(data))
+    return identity
+
+def _raise_fd_limit(wanted, reserve=64):
+    """Lift the soft open-file limit towards wanted + reserve, returning the usable number of sockets"""
+    try:
+        import resource
+    except ImportError:
+        return wanted
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted + reserve:
+        target = wanted + reserve if hard == resource.RLIM_INFINITY else min(hard, wanted + reserve)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    return max(1, min(wanted, soft - reserve))
+
+def scanner_budget(max_inflight, scanners, reserve_per_scanner=16):
+    """Per-scanner max_inflight when scanners run at once in one process and share its open-file limit
+
+    The limit is raised for all of them together, with room for each one's
+    event loop, files and HTTP connections, and what is usable is split evenly.
+    """
+    scanners = max(1, scanners)
+    total = _raise_fd_limit(max_inflight, reserve=64 + reserve_per_scanner * scanners)
+    return max(1, total // scanners)
+
+# Local resource exhaustion: too many sockets for the host, not a filtered port
+CONGESTION_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.EAGAIN}
+SOCKET_RETRIES = 5
+# Timeouts per canary re-probe of a port that answered, and the canary loss share that means the path is lossy
+CANARY_EVERY = 8
+LOSS_THRESHOLD = 0.1
+
+class AsyncPortScanner:
+    """Connect scanner with RTT-derived timeouts
+
+    With adaptive set, the probes in flight follow an AIMD window capped at
+    max_inflight. A timeout alone is not loss, since DROP firewalls time out
+    by design. Only canary probes to a port that answered before measure
+    loss: a lost canary shrinks the window, and while canaries are being
+    lost, filtered ports are probed once more before being reported.
+    Otherwise max_inflight probes run at all times.
+    With identify set, open ports are fingerprinted over the connection that
+    found them, so no second sweep is needed.
+    """
+    def __init__(self, max_inflight=1000, timeout=2.0, min_timeout=0.2, adaptive=False, identify=False,
+                 banner_timeout=1.0):
+        self.max_inflight = _raise_fd_limit(max_inflight)
+        self.adaptive = adaptive
+        self.identify = identify
+        self.banner_timeout = banner_timeout
+        # A fixed window is an AIMD controller whose floor and ceiling meet
+        floor = None if adaptive else self.max_inflight
+        self.controller = AIMDController(self.max_inflight, minimum=floor, initial=floor,
+                                         max_timeout=timeout, min_timeout=min_timeout)
+        # Per host: last port that answered, latest canary, timeouts since it and loss estimate
+        self.responsive = {}
+        self.canaries = {}
+        self.timeouts = {}
+        self.loss = {}
+        # Ports that timed out while canaries were being lost, so adaptive_map probes them again
+        self.suspect = set()
+    
+    def current_timeout(self):
+        """Retransmission-style timeout derived from measured connect RTTs"""
+        return self.controller.timeout()
+    
+    async def _connect(self, loop, sock, host, port):
+        """Connect sock, returning open, closed, filtered, timeout or unprobed"""
+        start = time.perf_counter()
+        token = METRICS.start('tcp')
+        # Stays 'cancelled' if the scan is abandoned mid-connect, so the in-flight gauge is still released
+        outcome = 'cancelled'
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (host, port)), self.current_timeout())
+            outcome = 'ok'
+            self.controller.observe(time.perf_counter() - start)
+            self.responsive[host] = port
+            return 'open'
+        except ConnectionRefusedError:
+            outcome = 'ok'
+            # A reset is as good an RTT sample as a completed handshake
+            self.controller.observe(time.perf_counter() - start)
+            self.responsive[host] = port
+            return 'closed'
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            return 'timeout'
+        except OSError as e:
+            outcome = 'error'
+            if e.errno in CONGESTION_ERRNOS:
+                # The SYN never left this host, so nothing is known about the port
+                self.controller.congestion()
+                return 'unprobed'
+            return 'filtered'
+        finally:
+            METRICS.stop(token, outcome)
+    
+    async def _socket(self, family):
+        """Non-blocking TCP socket, backing off while the process is out of descriptors, or None"""
+        for attempt in range(SOCKET_RETRIES):
+            try:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+            except OSError as e:
+                if e.errno not in CONGESTION_ERRNOS:
+                    raise
+                self.controller.congestion()
+                await asyncio.sleep(0.05 * 2 ** attempt)
+                continue
+            sock.setblocking(False)
+            return sock
+        return None
+    
+    async def _lost(self, loop, host):
+        """Whether timeouts on host currently look like loss rather than filtering
+
+        Every CANARY_EVERY timeouts the last port that answered is probed again;
+        the share of those canaries that time out estimates the path's loss.
+        A host where nothing ever answered is assumed to be filtering.
+        """
+        port = self.responsive.get(host)
+        if port is None:
+            return False
+        canary = self.canaries.get(host)
+        if canary is None or canary.done():
+            self.timeouts[host] = self.timeouts.get(host, 0) + 1
+            if host not in self.loss or self.timeouts[host] >= CANARY_EVERY:
+                self.timeouts[host] = 0
+                canary = self.canaries[host] = asyncio.ensure_future(self._canary(loop, host, port))
+        if not canary.done():
+            # Shielded so a probe abandoned mid-wait does not cancel the canary others are waiting on
+            await asyncio.shield(canary)
+        return self.loss.get(host, 0.0) > LOSS_THRESHOLD
+    
+    async def _canary(self, loop, host, port):
+        """Probe a port that answered before and fold the result into host's loss estimate"""
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            # Out of descriptors: nothing was learned about the path
+            return
+        sock.setblocking(False)
+        lost = 0.0
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (host, port)), self.current_timeout())
+        except asyncio.TimeoutError:
+            lost = 1.0
+        except OSError:
+            pass
+        finally:
+            sock.close()
+        estimate = self.loss.get(host, lost)
+        self.loss[host] = estimate + (lost - estimate) / 4
+        if lost:
+            self.controller.congestion()
+    
+    def _dropped(self, result):
+        """adaptive_map retry test: ports never probed, or that timed out during confirmed loss"""
+        port, state, _ = result
+        if state == 'filtered' and port in self.suspect:
+            self.suspect.discard(port)
+            return True
+        return state == 'unprobed'
+    
+    async def probe(self, host, port):
+        """Connect to one port, returning (port, state, identity) with state open, closed, filtered or unprobed
+
+        unprobed means local resources (descriptors, buffers) ran out before a SYN
+        could be sent; the port was not scanned and should be tried again later.
+        identity is (service, product, version) for open ports when identify is set and a signature matched, else None.
+        """
+        loop = asyncio.get_event_loop()
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        sock = await self._socket(family)
+        if sock is None:
+            # Descriptors never freed up; report the port as not scanned rather than aborting the scan
+            return port, 'unprobed', None
+        try:
+            state = await self._connect(loop, sock, host, port)
+            identity = None
+            if state == 'open' and self.identify:
+                identity = await identify_service(loop, sock, port, self.banner_timeout)
+        finally:
+            sock.close()
+        if state == 'timeout':
+            state = 'filtered'
+            if self.adaptive and await self._lost(loop, host):
+                self.suspect.add(port)
+        return port, state, identity
+    
+    async def scan(self, host, ports):
+        """Yield (port, state, identity) for every port as probes complete"""
+        async def probe(port):
+            return await self.probe(host, port)
+        
+        if self.adaptive:
+            results = adaptive_map(probe, ports, self.controller, self._dropped)
+        else:
+            results = bounded_map(probe, ports, min(self.max_inflight, max(1, len(ports))))
+        async for result in results:
+            yield result
+    
+    def iter_scan(self, host, ports):
+        """Blocking generator around scan"""
+        return iterate_async(self.scan(host, ports))
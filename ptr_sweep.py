@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Reverse-DNS (PTR) sweeps over IPv4 and IPv6 CIDR ranges
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import ipaddress
+import time
+import dns.asyncquery
+import dns.exception
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+import dns.reversename
+from async_utils import bounded_map, iterate_async
+from dns_engine import QUERY_OUTCOMES, negative_ttl
+from metrics import METRICS
+
+def iter_addresses(cidrs):
+    """Lazily yield every host address of each CIDR; a /16 or an IPv6 /64 never sits in memory"""
+    for cidr in cidrs:
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+        # hosts() drops the network and broadcast addresses, which /31, /32, /127 and /128 do not have
+        if network.prefixlen >= network.max_prefixlen - 1:
+            yield from network
+        else:
+            yield from network.hosts()
+
+def count_addresses(cidrs):
+    """Number of addresses iter_addresses yields, without generating them"""
+    total = 0
+    for cidr in cidrs:
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+        short = network.prefixlen >= network.max_prefixlen - 1
+        # IPv6 hosts() skips only the subnet-router anycast address
+        total += network.num_addresses - (0 if short else 1 if network.version == 6 else 2)
+    return total
+
+class TokenBucket:
+    """Rate cap for one resolver: rate queries per second on average, bursts of up to burst
+
+    Each query reserves the next free send slot, so waiters sleep exactly
+    once and never contend for tokens.
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate / 10)
+        self.next_slot = 0.0
+    
+    def reserve(self):
+        """Claim the next slot and return how long to wait for it"""
+        now = time.monotonic()
+        # Unused capacity accumulates, but only up to burst queries
+        self.next_slot = max(self.next_slot, now - self.burst / self.rate)
+        wait = self.next_slot - now
+        self.next_slot += 1 / self.rate
+        return wait
+
+class PTRSweeper:
+    """Pipelined PTR lookups spread over several resolvers, each behind its own token bucket
+
+    Queries go straight to the resolvers over UDP rather than through a stub
+    resolver, so the sweep itself decides which server gets each query: the one
+    whose bucket frees up first. A timed-out or failed query is retried once
+    on another resolver when there is one.
+    """
+    def __init__(self, nameservers=None, port=53, timeout=2.0, rate=200.0, cache=None):
+        if not nameservers:
+            nameservers = dns.resolver.Resolver().nameservers
+        self.nameservers = list(nameservers)
+        self.port = port
+        self.timeout = timeout
+        self.cache = cache
+        self.buckets = [TokenBucket(rate) if rate else None for _ in self.nameservers]
+    
+    def _pick(self, exclude=None):
+        """Index of the resolver whose next send slot comes first"""
+        choices = [i for i in range(len(self.nameservers)) if i != exclude] or [exclude]
+        return min(choices, key=lambda i: self.buckets[i].next_slot if self.buckets[i] else 0.0)
+    
+    async def _send(self, index, query):
+        bucket = self.buckets[index]
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        return await dns.asyncquery.udp(query, self.nameservers[index], timeout=self.timeout, port=self.port)
+    
+    async def lookup(self, address):
+        """Return (address, names, error) for one IP; error is None, 'NXDOMAIN', 'TIMEOUT', 'SERVFAIL'..."""
+        address = str(address)
+        name = dns.reversename.from_address(address)
+        if self.cache is not None:
+            hit = self.cache.get(name.to_text(), 'PTR')
+            if hit is not None:
+                return address, hit[0], hit[1]
+        
+        query = dns.message.make_query(name, dns.rdatatype.PTR)
+        token = METRICS.start('dns')
+        outcome = 'cancelled'
+        tried = None
+        names, ttl = [], 0
+        try:
+            for attempt in range(2):
+                tried = self._pick(exclude=tried)
+                try:
+                    response = await self._send(tried, query)
+                except dns.exception.Timeout:
+                    error = 'TIMEOUT'
+                    continue
+                except Exception as e:
+                    error = f'ERROR: {e}'
+                    continue
+                rcode = response.rcode()
+                if rcode == dns.rcode.NOERROR:
+                    names = sorted({rdata.target.to_text().rstrip('.') for rrset in response.answer
+                                    if rrset.rdtype == dns.rdatatype.PTR for rdata in rrset})
+                    error = None if names else 'NOANSWER'
+                    ttl = min((rrset.ttl for rrset in response.answer), default=0)
+                    break
+                if rcode == dns.rcode.NXDOMAIN:
+                    names, error = [], 'NXDOMAIN'
+                    ttl = negative_ttl([response])
+                    break
+                error = dns.rcode.to_text(rcode)
+            outcome = QUERY_OUTCOMES.get(error, 'error')
+        finally:
+            # Also runs when the sweep is cancelled, so the in-flight gauge does not leak
+            METRICS.stop(token, outcome)
+        
+        if self.cache is not None and ttl > 0:
+            self.cache.put(name.to_text(), 'PTR', names, error, ttl)
+        return address, names, error
+    
+    async def sweep(self, addresses, concurrency=200):
+        """Yield (address, names, error) as answers arrive, with at most concurrency queries in flight"""
+        async for result in bounded_map(self.lookup, addresses, concurrency):
+            yield result
+    
+    def iter_sweep(self, addresses, concurrency=200):
+        """Blocking generator around sweep"""
+        return iterate_async(self.sweep(addresses, concurrency))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Typed result records and a streaming JSONL writer
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import json
+import threading
+from dataclasses import dataclass, fields
+
+class Record:
+    """Base for result records: slotted dataclasses serialised as one JSON object each"""
+    __slots__ = ()
+    kind = 'record'
+    
+    def to_dict(self):
+        data = {'type': self.kind}
+        for field in fields(self):
+            data[field.name] = getattr(self, field.name)
+        return data
+
+@dataclass
+class DNSAnswer(Record):
+    __slots__ = ('name', 'rtype', 'value')
+    kind = 'dns'
+    name: str
+    rtype: str
+    value: str
+
+@dataclass
+class Subdomain(Record):
+    __slots__ = ('name', 'ips')
+    kind = 'subdomain'
+    name: str
+    ips: list
+
+@dataclass
+class OpenPort(Record):
+    __slots__ = ('host', 'port', 'service', 'product', 'version')
+    kind = 'port'
+    host: str
+    port: int
+    service: str
+    product: str
+    version: str
+
+@dataclass
+class Certificate(Record):
+    __slots__ = ('host', 'port', 'sni', 'subject_cn', 'issuer', 'not_after', 'sans')
+    kind = 'certificate'
+    host: str
+    port: int
+    sni: str
+    subject_cn: str
+    issuer: str
+    not_after: str
+    sans: list
+
+@dataclass
+class IPInfo(Record):
+    __slots__ = ('ip', 'asn', 'country', 'org', 'source', 'details')
+    kind = 'ip'
+    ip: str
+    asn: str
+    country: str
+    org: str
+    source: str
+    details: dict
+
+@dataclass
+class HTTPFinding(Record):
+    __slots__ = ('url', 'category', 'name', 'value')
+    kind = 'http'
+    url: str
+    category: str
+    name: str
+    value: object
+
+@dataclass
+class HeaderAudit(Record):
+    __slots__ = ('url', 'final_url', 'status', 'score', 'missing')
+    kind = 'header-audit'
+    url: str
+    final_url: str
+    status: int
+    score: float
+    missing: list
+
+@dataclass
+class Page(Record):
+    __slots__ = ('url', 'final_url', 'depth', 'status', 'content_type', 'size', 'content_hash', 'duplicate_of')
+    kind = 'page'
+    url: str
+    final_url: str
+    depth: int
+    status: int
+    content_type: str
+    size: int
+    content_hash: str
+    duplicate_of: str
+
+@dataclass
+class Technology(Record):
+    __slots__ = ('url', 'name', 'category')
+    kind = 'technology'
+    url: str
+    name: str
+    category: str
+
+@dataclass
+class Account(Record):
+    __slots__ = ('username', 'platform', 'url')
+    kind = 'account'
+    username: str
+    platform: str
+    url: str
+
+@dataclass
+class EmailCandidate(Record):
+    __slots__ = ('email', 'pattern')
+    kind = 'email'
+    email: str
+    pattern: str
+
+@dataclass
+class ScanError(Record):
+    __slots__ = ('target', 'module', 'error')
+    kind = 'error'
+    target: str
+    module: str
+    error: str
+
+@dataclass
+class Change(Record):
+    __slots__ = ('scope', 'change', 'record')
+    kind = 'change'
+    scope: str
+    change: str
+    record: dict
+
+def record_from_dict(data):
+    """Rebuild a record from its to_dict() form"""
+    cls = next(cls for cls in Record.__subclasses__() if cls.kind == data['type'])
+    return cls(**{key: value for key, value in data.items() if key != 'type'})
+
+class JSONLWriter:
+    """Appends each record as one JSON line and flushes it, so files can be tailed mid-scan"""
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+    
+    def write(self, record):
+        line = json.dumps(record.to_dict(), ensure_ascii=False, default=str) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            self.count += 1
+    
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+class RecordEmitter:
+    """Mixin giving a tool an optional sink that receives every record as it is produced
+
+    With a snapshot store attached, finished scans are passed through track();
+    in diff mode the sink then receives only the Change records.
+    """
+    sink = None
+    snapshots = None
+    
+    def emit(self, record):
+        if self.sink is not None and (self.snapshots is None or not self.snapshots.diff_only):
+            self.sink.write(record)
+        return record
+    
+    def track(self, scope, records, response=None):
+        """Snapshot a complete result set and return the records unchanged
+        
+        Later stages chain on the full results in every mode; in diff mode the
+        changes are printed and go to the sink, and the store keeps them for export.
+        """
+        if self.snapshots is None:
+            return records
+        changes = self.snapshots.compare(scope, records, response)
+        if not self.snapshots.diff_only:
+            return records
+        if changes:
+            print(f"   🔁 {len(changes)} changes since the last snapshot")
+        for change in changes:
+            summary = ' '.join(str(value) for key, value in change.record.items() if key != 'type')
+            print(f"     {'+' if change.change == 'added' else '-'} {change.record['type']}: {summary}")
+            if self.sink is not None:
+                self.sink.write(change)
+        return records
+
+def to_jsonable(value):
+    """json.dump default hook for records nested in result structures"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
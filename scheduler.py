@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Batch job scheduler with global and per-host concurrency limits
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import concurrent.futures
+import time
+from collections import OrderedDict, deque
+
+class BatchScheduler:
+    def __init__(self, max_workers=16, per_host=2):
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+    
+    def run(self, jobs):
+        """Run (host, name, func) jobs, yielding (host, name, result, error, elapsed) as each completes
+
+        Hosts take turns, so one host with many jobs never starves the rest
+        and never has more than per_host jobs running at once.
+        """
+        queues = OrderedDict()
+        for host, name, func in jobs:
+            queues.setdefault(host, deque()).append((name, func))
+        
+        active = dict.fromkeys(queues, 0)
+        ready = deque(queues)
+        queued = set(ready)
+        running = {}
+        
+        def timed(func):
+            start = time.perf_counter()
+            return func(), time.perf_counter() - start
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    host = ready.popleft()
+                    queued.discard(host)
+                    name, func = queues[host].popleft()
+                    running[executor.submit(timed, func)] = (host, name, time.perf_counter())
+                    active[host] += 1
+                    if queues[host] and active[host] < self.per_host:
+                        ready.append(host)
+                        queued.add(host)
+                
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    host, name, submitted = running.pop(future)
+                    active[host] -= 1
+                    if queues[host] and host not in queued:
+                        ready.append(host)
+                        queued.add(host)
+                    try:
+                        result, elapsed = future.result()
+                        yield host, name, result, None, elapsed
+                    except Exception as e:
+                        yield host, name, None, e, time.perf_counter() - submitted
+
+def adaptive_threads(func, items, controller, dropped, retries=1):
+    """Thread-pool counterpart of async_utils.adaptive_map for blocking probes (requests, sockets)
+
+    Yields func(item) results as they complete, with controller.window()
+    calls running at once and dropped results retried before fresh items.
+    """
+    items = iter(items)
+    retry = deque()
+    running = {}
+    exhausted = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        try:
+            while True:
+                while len(running) < controller.window() and (retry or not exhausted):
+                    if retry:
+                        item, attempt = retry.popleft()
+                    else:
+                        try:
+                            item, attempt = next(items), 0
+                        except StopIteration:
+                            exhausted = True
+                            break
+                    running[executor.submit(func, item)] = (item, attempt)
+                if not running:
+                    break
+                
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    item, attempt = running.pop(future)
+                    result = future.result()
+                    if attempt < retries and dropped(result):
+                        controller.retried += 1
+                        retry.append((item, attempt + 1))
+                        continue
+                    yield result
+        finally:
+            for future in running:
+                future.cancel()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Snapshot store for incremental re-scans and change reports (--snapshot, --diff)
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dns_cache import default_cache_dir
+from records import Change, record_from_dict
+
+def body_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+def _canonical(data):
+    """Stable JSON for a record dict; list fields are order-insensitive (DNS answers rotate)"""
+    data = {key: sorted(value, key=str) if isinstance(value, list) else value for key, value in data.items()}
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+
+class SnapshotStore:
+    """SQLite record of the last complete result set per scan scope
+
+    A scope is a scan_key such as 'ports:example.com:3f2a...'. HTTP scopes also
+    keep the body hash and the ETag/Last-Modified validators of the page they
+    were parsed from, so a re-run can ask the server whether anything changed.
+    With diff_only set, the sink and export receive Change records instead of the full
+    output; the tools themselves still return full results so stages can chain.
+    """
+    def __init__(self, path=None, diff_only=False):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'snapshots.sqlite3')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        self.path = path
+        self.diff_only = diff_only
+        # Change records found during this run, in order, for the --diff export
+        self.changes = []
+        self.lock = threading.Lock()
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS snapshots (
+            scope TEXT PRIMARY KEY,
+            digest TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            records TEXT NOT NULL,
+            seen REAL NOT NULL
+        )''')
+    
+    def _row(self, scope):
+        with self.lock:
+            return self.conn.execute(
+                'SELECT digest, etag, last_modified, records FROM snapshots WHERE scope = ?', (scope,)
+            ).fetchone()
+    
+    def revalidate(self, scope, url, response=None, timeout=15):
+        """Return (response, previous records), where previous is None unless the page is unchanged
+
+        Without a response in hand the page is fetched conditionally with the
+        scope's validators; a 304, or a body hashing to the stored digest,
+        means the previous records still hold and parsing can be skipped.
+        """
+        from http_layer import RESPONSES, fetch
+        row = self._row(scope)
+        if response is None:
+            response = RESPONSES.get(url)
+        if response is None:
+            conditional = {}
+            if row is not None and row[1]:
+                conditional['If-None-Match'] = row[1]
+            if row is not None and row[2]:
+                conditional['If-Modified-Since'] = row[2]
+            response = fetch(url, timeout, headers=conditional or None)
+        if row is None:
+            return response, None
+        if response.status_code == 304 or body_hash(response.content) == row[0]:
+            return response, [record_from_dict(data) for data in json.loads(row[3])]
+        return response, None
+    
+    def compare(self, scope, records, response=None):
+        """Store records as scope's snapshot and return Change records against the previous one"""
+        current = {}
+        for record in records:
+            data = record.to_dict()
+            current[_canonical(data)] = data
+        
+        row = self._row(scope)
+        previous = {}
+        if row is not None:
+            for data in json.loads(row[3]):
+                previous[_canonical(data)] = data
+        
+        digest, etag, last_modified = row[:3] if row is not None else (None, None, None)
+        # A 304 carries no body, so the stored digest and validators stay valid
+        if response is not None and response.status_code != 304 and hasattr(response, 'content'):
+            digest = body_hash(response.content)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)',
+                (scope, digest, etag, last_modified, json.dumps(list(current.values()), default=str), time.time())
+            )
+        
+        changes = [Change(scope, 'added', current[key]) for key in sorted(current.keys() - previous.keys())]
+        changes += [Change(scope, 'removed', previous[key]) for key in sorted(previous.keys() - current.keys())]
+        self.changes.extend(changes)
+        return changes
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
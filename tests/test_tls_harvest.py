@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the DER certificate parser in tls_harvest
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+
+Run with: python -m unittest discover tests
+"""
+
+import os
+import ssl
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tls_harvest import in_scope, parse_certificate
+
+# v3, UTF8String/PrintableString names, UTCTime validity, DNS and IPv4/IPv6 SANs
+SAN_CERT = ssl.PEM_cert_to_DER_cert("""-----BEGIN CERTIFICATE-----
+MIICFzCCAb6gAwIBAgIUastRA99X24azQRJv4ubfEFi3hx0wCgYIKoZIzj0EAwIw
+PTELMAkGA1UEBhMCVVMxFDASBgNVBAoMC0V4YW1wbGUgT3JnMRgwFgYDVQQDDA93
+d3cuZXhhbXBsZS5jb20wHhcNMjYxMDE4MjE0OTUyWhcNMjcxMDE4MjE0OTUyWjA9
+MQswCQYDVQQGEwJVUzEUMBIGA1UECgwLRXhhbXBsZSBPcmcxGDAWBgNVBAMMD3d3
+dy5leGFtcGxlLmNvbTBZMBMGByqGSM49AgEGCCqGSM49AwEHA0IABBFV0gWJKCXP
+w9tqqDgucmxxFesEdqVyC1IKKe5nFSigHtXnUMH0XUYiTOxxWxzZXruIvMXb39ll
+HLLxaOjWO86jgZswgZgwHQYDVR0OBBYEFBJ5Ug1DJXUL56dzkIaabjmjLH/XMB8G
+A1UdIwQYMBaAFBJ5Ug1DJXUL56dzkIaabjmjLH/XMA8GA1UdEwEB/wQFMAMBAf8w
+RQYDVR0RBD4wPIIPd3d3LmV4YW1wbGUuY29tghEqLkRldi5FeGFtcGxlLmNvbYcE
+wAACCocQIAENuAAAAAAAAAAAAAAAATAKBggqhkjOPQQDAgNHADBEAiB+fE84oGXl
+cjgJRsrILVU+YHGXU5fhqYGsTK57cth6fAIgMJhEv/bcVzDNWm17lzUKzj2GmfhP
+49TPaRtN9Aav0Mw=
+-----END CERTIFICATE-----
+""")
+
+# v1 (no version or extensions), BMPString names, GeneralizedTime notAfter
+BMP_CERT = ssl.PEM_cert_to_DER_cert("""-----BEGIN CERTIFICATE-----
+MIIBgDCCAScCFAU43Q0U1fAOMFJA6S9zhvw2NKhwMAoGCCqGSM49BAMCMEIxJzAl
+BgNVBAMeHgBiAG0AcAAuAGUAeABhAG0AcABsAGUALgBvAHIAZzEXMBUGA1UECh4O
+AEIATQBQACAATwByAGcwIBcNMjYxMDE4MjE0OTUyWhgPMjA1OTA4MjYyMTQ5NTJa
+MEIxJzAlBgNVBAMeHgBiAG0AcAAuAGUAeABhAG0AcABsAGUALgBvAHIAZzEXMBUG
+A1UECh4OAEIATQBQACAATwByAGcwWTATBgcqhkjOPQIBBggqhkjOPQMBBwNCAAQR
+VdIFiSglz8Pbaqg4LnJscRXrBHalcgtSCinuZxUooB7V51DB9F1GIkzscVsc2V67
+iLzF29/ZZRyy8Wjo1jvOMAoGCCqGSM49BAMCA0cAMEQCID98S/UcVZccAtYngVYD
+jKKWzT+kS61sXrBfGmK6r5PfAiA9cj7I7ZtKOLmNrJGXa4HXq858fuE5MVQa/J0U
+NAAjHQ==
+-----END CERTIFICATE-----
+""")
+
+class ParseCertificateTest(unittest.TestCase):
+    def test_subject_issuer_and_sans(self):
+        cert = parse_certificate(SAN_CERT)
+        self.assertEqual(cert['subject_cn'], 'www.example.com')
+        self.assertEqual(cert['issuer'], 'C=US, O=Example Org, CN=www.example.com')
+        self.assertEqual(cert['sans'], ['www.example.com', '*.dev.example.com', '192.0.2.10', '2001:db8::1'])
+
+    def test_utctime(self):
+        self.assertEqual(parse_certificate(SAN_CERT)['not_after'], '2027-10-18T21:49:52Z')
+
+    def test_bmpstring_and_generalized_time(self):
+        cert = parse_certificate(BMP_CERT)
+        self.assertEqual(cert['subject_cn'], 'bmp.example.org')
+        self.assertEqual(cert['issuer'], 'CN=bmp.example.org, O=BMP Org')
+        self.assertEqual(cert['not_after'], '2059-08-26T21:49:52Z')
+        self.assertEqual(cert['sans'], [])
+
+    def test_truncated(self):
+        for size in (0, 1, 4, 100, len(SAN_CERT) - 1):
+            with self.subTest(size=size), self.assertRaisesRegex(ValueError, 'malformed certificate'):
+                parse_certificate(SAN_CERT[:size])
+
+    def test_indefinite_length(self):
+        with self.assertRaisesRegex(ValueError, 'indefinite length'):
+            parse_certificate(b'\x30\x80' + SAN_CERT[4:] + b'\x00\x00')
+
+    def test_inner_length_overrun(self):
+        # Grow the SAN extension's OCTET STRING past the end of its extension
+        data = bytearray(SAN_CERT)
+        data[data.index(b'\x55\x1d\x11') + 4] = 0x7f
+        with self.assertRaisesRegex(ValueError, 'malformed certificate'):
+            parse_certificate(bytes(data))
+
+class InScopeTest(unittest.TestCase):
+    def test_wildcards_and_suffixes(self):
+        self.assertEqual(in_scope('*.Dev.Example.com.', 'example.com'), 'dev.example.com')
+        self.assertEqual(in_scope('example.com', 'example.com'), 'example.com')
+        self.assertIsNone(in_scope('badexample.com', 'example.com'))
+
+if __name__ == '__main__':
+    unittest.main()
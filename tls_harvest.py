@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Concurrent TLS certificate harvesting (SAN/CN, issuer, expiry) to seed discovery
+ONLY FOR LEGAL AND EDUCATIONAL PURPOSES
+"""
+
+import asyncio
+import ipaddress
+import ssl
+from async_utils import bounded_map, iterate_async
+from metrics import METRICS
+
+TLS_PORTS = (443, 8443)
+
+# DER-encoded object identifiers the parser looks for
+OID_NAMES = {b'\x55\x04\x03': 'CN', b'\x55\x04\x0a': 'O', b'\x55\x04\x0b': 'OU', b'\x55\x04\x06': 'C'}
+OID_SUBJECT_ALT_NAME = b'\x55\x1d\x11'
+
+def _tlv(data, offset, end=None):
+    """Decode the DER tag and length at offset, returning (tag, value start, value end)
+
+    Raises ValueError when the element does not fit before end (default: the
+    end of data), or uses a form DER forbids (indefinite length, high tag numbers).
+    """
+    end = len(data) if end is None else end
+    if offset + 2 > end:
+        raise ValueError(f'truncated element at offset {offset}')
+    tag = data[offset]
+    length = data[offset + 1]
+    if tag & 0x1f == 0x1f:
+        raise ValueError(f'unsupported high tag number at offset {offset}')
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7f
+        if size == 0:
+            raise ValueError(f'indefinite length at offset {offset - 2}')
+        if size > 4 or offset + size > end:
+            raise ValueError(f'bad length at offset {offset - 2}')
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    if offset + length > end:
+        raise ValueError(f'element at offset {offset} overruns its container')
+    return tag, offset, offset + length
+
+def _children(data, start, end):
+    while start < end:
+        tag, value_start, value_end = _tlv(data, start, end)
+        yield tag, value_start, value_end
+        start = value_end
+
+def _string(tag, value):
+    if tag == 0x1e:  # BMPString
+        return value.decode('utf-16-be', errors='replace')
+    return value.decode('utf-8', errors='replace')
+
+def _name(data, start, end):
+    """[(attribute, value)] of an X.501 Name, in certificate order"""
+    attributes = []
+    for _, rdn_start, rdn_end in _children(data, start, end):
+        for _, atv_start, atv_end in _children(data, rdn_start, rdn_end):
+            parts = list(_children(data, atv_start, atv_end))
+            if len(parts) < 2:
+                raise ValueError('attribute without a value')
+            (_, oid_start, oid_end), (tag, value_start, value_end) = parts[:2]
+            label = OID_NAMES.get(bytes(data[oid_start:oid_end]))
+            if label:
+                attributes.append((label, _string(tag, bytes(data[value_start:value_end]))))
+    return attributes
+
+def _time(tag, value):
+    """ISO 8601 UTC from a UTCTime (0x17) or GeneralizedTime (0x18)"""
+    text = value.decode('ascii')
+    if tag == 0x17:
+        text = ('19' if int(text[:2]) >= 50 else '20') + text
+    if tag not in (0x17, 0x18) or len(text) < 15 or not text[:14].isdigit():
+        raise ValueError(f'bad certificate time {text!r}')
+    return f'{text[0:4]}-{text[4:6]}-{text[6:8]}T{text[8:10]}:{text[10:12]}:{text[12:14]}Z'
+
+def parse_certificate(der):
+    """Extract subject CN, issuer, notAfter and subjectAltName entries from a DER certificate
+
+    Only the handful of fields discovery needs are decoded; anything else in
+    the certificate is skipped without interpretation. Truncated or otherwise
+    malformed input raises ValueError.
+    """
+    try:
+        return _parse_certificate(memoryview(der))
+    except (IndexError, ValueError) as e:
+        raise ValueError(f'malformed certificate: {e}') from e
+
+def _parse_certificate(data):
+    _, cert_start, cert_end = _tlv(data, 0)
+    _, tbs_start, tbs_end = _tlv(data, cert_start, cert_end)
+    fields = list(_children(data, tbs_start, tbs_end))
+    if fields and fields[0][0] == 0xa0:  # explicit [0] version
+        fields = fields[1:]
+    if len(fields) < 6:
+        raise ValueError('too few TBSCertificate fields')
+    # serial, signature algorithm, issuer, validity, subject, public key, then optional [1] [2] [3]
+    issuer = _name(data, fields[2][1], fields[2][2])
+    validity = list(_children(data, fields[3][1], fields[3][2]))
+    subject = _name(data, fields[4][1], fields[4][2])
+    
+    sans = []
+    for tag, start, end in fields[6:]:
+        if tag != 0xa3:  # explicit [3] extensions
+            continue
+        _, seq_start, seq_end = _tlv(data, start, end)
+        for _, ext_start, ext_end in _children(data, seq_start, seq_end):
+            parts = list(_children(data, ext_start, ext_end))
+            if len(parts) < 2 or bytes(data[parts[0][1]:parts[0][2]]) != OID_SUBJECT_ALT_NAME:
+                continue
+            # extnValue is the last element (critical is optional); it wraps a SEQUENCE of GeneralName
+            _, value_start, value_end = parts[-1]
+            _, names_start, names_end = _tlv(data, value_start, value_end)
+            for name_tag, name_start, name_end in _children(data, names_start, names_end):
+                value = bytes(data[name_start:name_end])
+                if name_tag == 0x82:  # dNSName
+                    sans.append(value.decode('ascii', errors='replace').lower())
+                elif name_tag == 0x87:  # iPAddress
+                    sans.append(str(ipaddress.ip_address(value)))
+    
+    if len(validity) < 2:
+        raise ValueError('validity without notAfter')
+    not_after_tag, not_after_start, not_after_end = validity[1]
+    return {
+        'subject_cn': next((value for label, value in subject if label == 'CN'), ''),
+        'issuer': ', '.join(f'{label}={value}' for label, value in issuer),
+        'not_after': _time(not_after_tag, bytes(data[not_after_start:not_after_end])),
+        'sans': sans,
+    }
+
+def in_scope(name, domain):
+    """Hostname a certificate name points at inside domain, or None ('*.dev.example.com' gives 'dev.example.com')"""
+    name = name.lower().rstrip('.')
+    if name.startswith('*.'):
+        name = name[2:]
+    if name == domain or name.endswith('.' + domain):
+        return name
+    return None
+
+def _is_ip(value):
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+class CertificateHarvester:
+    """Bounded concurrent TLS handshakes that stop as soon as the certificate arrives
+
+    Verification is disabled so expired, self-signed and mismatched
+    certificates are still collected; nothing is sent after the handshake.
+    Results are cached per (host, port, SNI) for the life of the harvester.
+    A TLS session cache would not help here: a resumed handshake skips the
+    Certificate message entirely, so a repeat target is simply never dialled.
+    """
+    def __init__(self, concurrency=50, timeout=5.0):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        self.context.check_hostname = False
+        self.context.verify_mode = ssl.CERT_NONE
+        self.cache = {}
+    
+    async def fetch(self, host, port=443, sni=None):
+        """Return (host, port, sni, parsed certificate or None, error)"""
+        key = (host, port, sni or host)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        token = METRICS.start('tls')
+        writer = None
+        outcome, nbytes = 'cancelled', 0
+        try:
+            # IP literals are not valid SNI values; an empty server_hostname sends none
+            server_hostname = '' if _is_ip(key[2]) else key[2]
+            _, writer = await asyncio.wait_for(asyncio.open_connection(
+                host, port, ssl=self.context, server_hostname=server_hostname,
+                ssl_handshake_timeout=self.timeout), self.timeout)
+            der = writer.get_extra_info('ssl_object').getpeercert(binary_form=True)
+            result = key + (parse_certificate(der) if der else None, None if der else 'no certificate')
+            outcome, nbytes = 'ok', len(der or b'')
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            result = key + (None, 'TIMEOUT')
+        except Exception as e:
+            outcome = 'error'
+            result = key + (None, str(e) or type(e).__name__)
+        finally:
+            METRICS.stop(token, outcome, nbytes)
+            if writer is not None:
+                writer.close()
+        self.cache[key] = result
+        return result
+    
+    async def harvest(self, targets):
+        """Yield a fetch result for every (host, port, sni) target as handshakes finish"""
+        async for result in bounded_map(lambda target: self.fetch(*target), targets, self.concurrency):
+            yield result
+    
+    def iter_harvest(self, targets):
+        """Blocking generator around harvest"""
+        return iterate_async(self.harvest(targets))